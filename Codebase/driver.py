@@ -11,18 +11,23 @@ Argument - Input file in form of csv sheet along with absolute path with below c
 6. Output directory for storing results
 7. Comparison document name with absolute path
 """
-import sys
-# sys.path.append(r'./qmomi')
+import argparse
+import os
 import time
 import datetime
 
 from qmohi.src.input_parser import parse_input, get_uni_shc
+from qmohi.src.input_parser.shc_url_cache import SHCURLCache, SHC_URL_REFRESH_AGE
+from qmohi.src.input_parser.input_helper.cse_handler import configure_cse_cache
+from qmohi.src.input_parser.input_helper.key_scheduler import APIKeyScheduler, API_KEY_USAGE_FILE_NAME
 from qmohi.src.data_prep import filter_relevant_data, store_webpages, get_shc_webpages_with_keywords
+from qmohi.src.data_prep.page_store import PageStore
+from qmohi.src.checkpoint import Checkpoint
 from qmohi.src.metric_calc import reading_level, combine_results, metric_calculation1, metric_calculation2
 
 
 # Execute complete pipeline
-def execute(input_file_path):
+def execute(input_file_path, resume_dir=None, shc_refresh_age=SHC_URL_REFRESH_AGE, export_tfidf_stopwords=False):
 	timestamp = time.time()
 	date = datetime.datetime.fromtimestamp(timestamp)
 	print("Start: ", date.strftime('%H:%M:%S.%f'))
@@ -33,78 +38,110 @@ def execute(input_file_path):
 	# print("- Input file given by user: ", input_file_path)
 	file = parse_input.read_input_file(input_file_path)
 
-	# Set output directory for storing results
+	# Set output directory for storing results, or continue the interrupted run in the given directory
 	# print("- Setting up output directory: ", end="")
-	output_dir = parse_input.set_output_directory(file)
+	if resume_dir:
+		output_dir = parse_input.set_resume_directory(resume_dir)
+	else:
+		output_dir = parse_input.set_output_directory(file)
 
-	# Get university names from user input
-	# print("- Collecting input university names")
-	universities_list, no_of_universities = parse_input.get_input_university_names(file)
+	# Set cache directory for data reused across runs
+	cache_dir = parse_input.set_cache_directory(output_dir)
 
-	# Get API keys from user input
-	# print("- Collecting input API keys")
-	keys_list = parse_input.get_input_api_keys(file, 0, 0, force_pass=True)
+	# Reuse the custom search results of the previous runs
+	configure_cse_cache(cache_dir)
 
-	# Get CSE ID from user input
-	# print("- Collecting input CSE id", end="")
-	cse_id = parse_input.get_input_cse(file)
+	# Results of the completed phases are stored to resume the run
+	checkpoint = Checkpoint(output_dir)
 
-	# Get keywords and the comparison document path from user input
-	# print("- Collecting input keywords")
-	keyword_list, comparison_doc_path = parse_input.review_input_keywords(input_file_path, file, keys_list, cse_id, output_dir)
-	print(f'{keyword_list}, {comparison_doc_path}')
+	if checkpoint.is_completed("input"):
+		print("- Loaded from the checkpoint of the previous run")
+		universities_list, cse_id, keyword_list, comparison_doc_path, query_keywords, no_of_keys_for_shc, \
+			no_of_keys_for_site_specific_search, driver_path, model_path, margin = checkpoint.load("input")
 
-	# Divide the keywords in sets to make query
-	num_of_words, query_keywords = parse_input.divide_query_keywords(keyword_list)
+		# The API keys are not written to the checkpoint, they are read again from the input file
+		keys_list_for_shc, keys_list_for_site_specific_search = parse_input.get_input_api_keys(file, no_of_keys_for_shc, no_of_keys_for_site_specific_search)
+	else:
+		# Get university names from user input
+		# print("- Collecting input university names")
+		universities_list, no_of_universities = parse_input.get_input_university_names(file)
 
-	# Calculate minimum number of keys required
-	no_of_keys_for_shc, no_of_keys_for_site_specific_search = parse_input.calculate_num_keys_required(no_of_universities, num_of_words)
+		# Get API keys from user input
+		# print("- Collecting input API keys")
+		keys_list = parse_input.get_input_api_keys(file, 0, 0, force_pass=True)
 
-	# Get API keys from user input
-	# print("- Collecting input API keys")
-	keys_list_for_shc, keys_list_for_site_specific_search = parse_input.get_input_api_keys(file, no_of_keys_for_shc, no_of_keys_for_site_specific_search)
+		# Get CSE ID from user input
+		# print("- Collecting input CSE id", end="")
+		cse_id = parse_input.get_input_cse(file)
 
-	# Get Selenium web driver path from user input
-	# print("\n- Collecting input Selenium Web Driver", end="")
-	driver_path = parse_input.get_input_webdriver(file)
+		# Get keywords and the comparison document path from user input
+		# print("- Collecting input keywords")
+		keyword_list, comparison_doc_path = parse_input.review_input_keywords(input_file_path, file, keys_list, cse_id, output_dir)
+		print(f'{keyword_list}, {comparison_doc_path}')
+
+		# Divide the keywords in sets to make query
+		num_of_words, query_keywords = parse_input.divide_query_keywords(keyword_list)
+
+		# Calculate minimum number of keys required
+		no_of_keys_for_shc, no_of_keys_for_site_specific_search = parse_input.calculate_num_keys_required(no_of_universities, num_of_words)
 
-	# Get the pre-trained model for calculating similarity. If not provided, old method is used.
-	# print("- Collecting input model", end="")
-	model_path = parse_input.get_model(file)
+		# Get API keys from user input
+		# print("- Collecting input API keys")
+		keys_list_for_shc, keys_list_for_site_specific_search = parse_input.get_input_api_keys(file, no_of_keys_for_shc, no_of_keys_for_site_specific_search)
 
-	# Get the margin for the sentence extraction. If not provided, the function returns the default value (=2)
-	# print("- Collecting sentence extraction margin", end="")
-	margin = parse_input.get_sentence_extraction_margin(file)
+		# Get Selenium web driver path from user input
+		# print("\n- Collecting input Selenium Web Driver", end="")
+		driver_path = parse_input.get_input_webdriver(file)
 
-	# Get university SHC from university name
+		# Get the pre-trained model for calculating similarity. If not provided, old method is used.
+		# print("- Collecting input model", end="")
+		model_path = parse_input.get_model(file)
+
+		# Get the margin for the sentence extraction. If not provided, the function returns the default value (=2)
+		# print("- Collecting sentence extraction margin", end="")
+		margin = parse_input.get_sentence_extraction_margin(file)
+
+		checkpoint.save("input", (universities_list, cse_id, keyword_list, comparison_doc_path, query_keywords, no_of_keys_for_shc,
+								  no_of_keys_for_site_specific_search, driver_path, model_path, margin))
+
+	# Both search phases share the keys so that the quota left by one phase is used by the other,
+	# and the queries of the day are counted across runs so that a resumed run does not exceed the quota
+	key_scheduler = APIKeyScheduler(keys_list_for_shc + keys_list_for_site_specific_search, parse_input.get_input_daily_query_limit(file),
+									usage_path=os.path.join(cache_dir, API_KEY_USAGE_FILE_NAME))
+
+	# Get university SHC from university name, resolving only the universities new to the cache or stale
 	print("\nFinding university SHC websites...")
-	shc_websites_df = get_uni_shc.get_shc_urls_from_uni_name(universities_list, keys_list_for_shc, driver_path, cse_id, output_dir)
+	shc_url_cache = SHCURLCache(os.path.join(cache_dir, "shc_urls.json"), shc_refresh_age)
+	shc_websites_df = checkpoint.run("shc_websites", get_uni_shc.get_shc_urls_from_uni_name, universities_list, key_scheduler, driver_path, cse_id, output_dir, checkpoint.get_progress("shc_websites"), shc_url_cache)
 
 	# Get related web pages under SHC website having presence of input keywords
 	print("\n============ PHASE 2 =============\n")
 	print("Searching SHC web pages having presence of keywords...")
-	relevant_shc_webpages_df = get_shc_webpages_with_keywords.get_links(shc_websites_df, query_keywords, keys_list_for_site_specific_search, cse_id, output_dir)
+	relevant_shc_webpages_df = checkpoint.run("relevant_webpages", get_shc_webpages_with_keywords.get_links, shc_websites_df, query_keywords, key_scheduler, cse_id, output_dir, checkpoint.get_progress("relevant_webpages"))
 
 	# Store web pages in html format
 	print("\nSaving web pages on local computer...")
-	store_webpages.save_webpage_content(relevant_shc_webpages_df, output_dir)
+	page_store = PageStore(os.path.join(cache_dir, "webpages"))
+	checkpoint.run("saved_webpages", store_webpages.save_webpage_content, relevant_shc_webpages_df, output_dir, page_store)
 
 	# Find relevant content from retrieved website data
 	print("\nFiltering information relevant to keywords...")
-	topical_content_df, keyword_list, list_of_found_per_stem_dictionary, phrase_stem_dictionary, list_of_stem_found_phrase_dictionary = filter_relevant_data.find_relevant_content(relevant_shc_webpages_df, keyword_list, margin, output_dir)
+	topical_content_df, keyword_list, list_of_found_per_stem_dictionary, phrase_stem_dictionary, list_of_stem_found_phrase_dictionary = checkpoint.run("topical_content", filter_relevant_data.find_relevant_content, relevant_shc_webpages_df, keyword_list, margin, output_dir, cache_dir)
 
 	# Calculate overall reading level of relevant content retrieved from the urls
 	print("\n============ PHASE 3 =============\n")
 	print("Calculating Readability metric...")
-	reading_level_df = reading_level.get_reading_level(topical_content_df, output_dir)
+	reading_level_df = checkpoint.run("reading_level", reading_level.get_reading_level, topical_content_df, output_dir)
 
 	# Calculate quantity of keywords, Prevalence metric, Coverage metric
 	print("\nCalculating quantity of keywords, Prevalence metric, Coverage metric...")
-	metrics1_df = metric_calculation1.metric_calculation(reading_level_df, keyword_list, output_dir, list_of_found_per_stem_dictionary, phrase_stem_dictionary, list_of_stem_found_phrase_dictionary)
+	metrics1_df = checkpoint.run("metrics1", metric_calculation1.metric_calculation, reading_level_df, keyword_list, output_dir, list_of_found_per_stem_dictionary, phrase_stem_dictionary, list_of_stem_found_phrase_dictionary)
 
 	# Calculate Similarity metric, Objectivity metric, Polarity metric, Timeliness metric, Navigation metric
 	print("\nCalculating Similarity metric, Objectivity metric, Polarity metric, Timeliness metric, Navigation metric...")
-	metrics2_df = metric_calculation2.calculate_metrics(topical_content_df, output_dir, comparison_doc_path, driver_path, model_path)
+	# The stopwords found by TF-IDF for every university are exported into the output directory if requested
+	tfidf_stopword_dir = os.path.join(output_dir, "tfidf_stopwords") if export_tfidf_stopwords else None
+	metrics2_df = checkpoint.run("metrics2", metric_calculation2.calculate_metrics, topical_content_df, output_dir, comparison_doc_path, driver_path, model_path, page_store, checkpoint.get_progress("metrics2"), cache_dir, tfidf_stopword_dir)
 
 	# Consolidating final result together
 	print("\nConsolidating all metric values together...")
@@ -115,6 +152,40 @@ def execute(input_file_path):
 
 	print("\n============ FINISHED =============\n")
 
+# Resolve the SHC websites of the input universities into the cache, so that the runs skip the lookups
+def prewarm_shc(input_file_path, shc_refresh_age=SHC_URL_REFRESH_AGE):
+	file = parse_input.read_input_file(input_file_path)
+	cache_dir = parse_input.get_input_cache_directory(file)
+
+	universities_list, no_of_universities = parse_input.get_input_university_names(file)
+	cse_id = parse_input.get_input_cse(file)
+	no_of_keys_for_shc, _ = parse_input.calculate_num_keys_required(no_of_universities, 0)
+	keys_list_for_shc, _ = parse_input.get_input_api_keys(file, no_of_keys_for_shc, 0)
+	driver_path = parse_input.get_input_webdriver(file)
+
+	# Reuse the custom search results of the previous runs
+	configure_cse_cache(cache_dir)
+
+	key_scheduler = APIKeyScheduler(keys_list_for_shc, parse_input.get_input_daily_query_limit(file),
+									usage_path=os.path.join(cache_dir, API_KEY_USAGE_FILE_NAME))
+
+	print("Resolving university SHC websites...")
+	shc_url_cache = SHCURLCache(os.path.join(cache_dir, "shc_urls.json"), shc_refresh_age)
+	no_of_resolved = get_uni_shc.prewarm_shc_urls(universities_list, key_scheduler, driver_path, cse_id, shc_url_cache)
+	print(f"- Resolved {no_of_resolved} of {no_of_universities} universities, the others were up to date")
+
+
 if __name__ == "__main__":
-	import sys
-	execute(sys.argv[1])
+	parser = argparse.ArgumentParser(description="Quantitative Measures of Online Health Information")
+	parser.add_argument("input_file_path", help="Input file in form of csv sheet along with absolute path")
+	parser.add_argument("--resume", metavar="OUTPUT_DIR", help="Output directory of an interrupted run to continue, skipping completed phases")
+	parser.add_argument("--prewarm-shc", action="store_true", help="Only resolve the SHC websites of the universities into the cache")
+	parser.add_argument("--shc-refresh-age", type=int, default=SHC_URL_REFRESH_AGE, metavar="DAYS",
+						help="Days after which a cached SHC website is resolved again")
+	parser.add_argument("--export-tfidf-stopwords", action="store_true",
+						help="Export the stopwords found by TF-IDF for every university into the output directory")
+	args = parser.parse_args()
+	if args.prewarm_shc:
+		prewarm_shc(args.input_file_path, args.shc_refresh_age)
+	else:
+		execute(args.input_file_path, args.resume, args.shc_refresh_age, args.export_tfidf_stopwords)
@@ -0,0 +1,25 @@
+"""
+Write files at once, so that readers and concurrent runs never see a partial file
+Input - path of the file to write
+Output - file object of a temporary file, moved onto the path once it is written
+"""
+import os
+from contextlib import contextmanager
+from os.path import dirname
+from tempfile import NamedTemporaryFile
+
+
+# Write into a temporary file next to the path and replace the file with it, the temporary file is removed if writing fails
+@contextmanager
+def atomic_write(path, mode="w"):
+	f = NamedTemporaryFile(mode, dir=dirname(path) or ".", suffix=".tmp", delete=False)
+	try:
+		with f:
+			yield f
+		os.replace(f.name, path)
+	except BaseException:
+		try:
+			os.remove(f.name)
+		except OSError:
+			pass
+		raise
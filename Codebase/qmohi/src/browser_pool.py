@@ -0,0 +1,138 @@
+"""
+Pool of headless Chrome sessions shared by the process
+Input - path of the Selenium Chrome web driver
+Output - browser sessions started on first use, reused across calls and quit when the program exits
+"""
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+# Maximum number of Chrome processes started by a pool
+BROWSER_POOL_SIZE = 2
+# Seconds to wait for a page to load
+PAGE_LOAD_TIMEOUT = 60
+
+
+class BrowserPool:
+	def __init__(self, driver_path, size=BROWSER_POOL_SIZE, page_load_timeout=PAGE_LOAD_TIMEOUT):
+		self.driver_path = driver_path
+		self.size = size
+		self.page_load_timeout = page_load_timeout
+		self.idle_browsers = queue.LifoQueue()
+		self.browsers = []
+		self.lock = threading.Lock()
+
+	def start_browser(self):
+		options = Options()
+		options.add_argument("--headless")  # Runs Chrome in headless mode.
+
+		# Run web driver with the driver_path provided by user
+		driver = webdriver.Chrome(self.driver_path, chrome_options=options)
+		driver.set_page_load_timeout(self.page_load_timeout)
+		return driver
+
+	# Get an idle browser, starting a new one only if all the started ones are busy and the pool is not full
+	def acquire(self):
+		while True:
+			try:
+				return self.idle_browsers.get_nowait()
+			except queue.Empty:
+				pass
+
+			with self.lock:
+				start_new = len(self.browsers) < self.size
+				if start_new:
+					# Reserve the place before starting Chrome, which takes a few seconds
+					self.browsers.append(None)
+
+			if start_new:
+				break
+
+			# Check again from time to time in case a busy browser was discarded instead of released
+			try:
+				return self.idle_browsers.get(timeout=1)
+			except queue.Empty:
+				pass
+
+		try:
+			driver = self.start_browser()
+		except Exception:
+			with self.lock:
+				self.browsers.remove(None)
+			raise
+		with self.lock:
+			self.browsers[self.browsers.index(None)] = driver
+		return driver
+
+	def release(self, driver):
+		self.idle_browsers.put(driver)
+
+	# Quit a browser that stopped responding so that a new one takes its place
+	def discard(self, driver):
+		with self.lock:
+			if driver in self.browsers:
+				self.browsers.remove(driver)
+		try:
+			driver.quit()
+		except Exception:
+			pass
+
+	# Borrow a browser for the duration of the with block
+	@contextmanager
+	def browser(self):
+		driver = self.acquire()
+		healthy = True
+		try:
+			yield driver
+		except WebDriverException:
+			healthy = False
+			raise
+		finally:
+			if healthy:
+				self.release(driver)
+			else:
+				self.discard(driver)
+
+	def close(self):
+		with self.lock:
+			browsers = [driver for driver in self.browsers if driver is not None]
+			self.browsers = []
+		self.idle_browsers = queue.LifoQueue()
+		for driver in browsers:
+			try:
+				driver.quit()
+			except Exception:
+				pass
+
+
+browser_pools = {}
+browser_pools_lock = threading.Lock()
+
+
+# Get the pool of the web driver, created on first use
+def get_browser_pool(driver_path):
+	with browser_pools_lock:
+		if driver_path not in browser_pools:
+			browser_pools[driver_path] = BrowserPool(driver_path)
+		return browser_pools[driver_path]
+
+
+# Forget the pools inherited from the parent process without quitting their browsers, which still belong to the parent
+def reset_browser_pools():
+	global browser_pools, browser_pools_lock
+	browser_pools = {}
+	browser_pools_lock = threading.Lock()
+
+
+# Quit all the browsers so that no Chrome process outlives the program
+@atexit.register
+def close_browser_pools():
+	with browser_pools_lock:
+		for pool in browser_pools.values():
+			pool.close()
+		browser_pools.clear()
+
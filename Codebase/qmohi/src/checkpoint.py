@@ -0,0 +1,91 @@
+"""
+Checkpoints of the pipeline for resuming an interrupted run
+Input - output directory of the run
+Output - results of the completed phases and of the universities completed within a phase
+"""
+import os
+import pickle
+from os import makedirs
+from os.path import isfile, join
+
+from qmohi.src.atomic_write import atomic_write
+
+CHECKPOINT_DIR_NAME = "checkpoints"
+
+
+# Results of the universities completed within a phase, appended as each university is done
+class PhaseProgress:
+	def __init__(self, progress_path):
+		self.progress_path = progress_path
+		self.records = {}
+
+		if isfile(progress_path):
+			with open(progress_path, 'r+b') as f:
+				# End of the last complete record
+				offset = 0
+				while True:
+					try:
+						key, record = pickle.load(f)
+					except EOFError:
+						break
+					except (pickle.UnpicklingError, ValueError, AttributeError, ImportError, IndexError, TypeError):
+						# The last record may be incomplete if the run was interrupted while writing it,
+						# it is removed so that the records appended by this run can be read by the next one
+						print("Discarding the incomplete record at the end of", progress_path)
+						break
+					self.records[key] = record
+					offset = f.tell()
+
+				if offset != os.fstat(f.fileno()).st_size:
+					f.truncate(offset)
+					f.flush()
+					os.fsync(f.fileno())
+
+	def __contains__(self, key):
+		return key in self.records
+
+	def get(self, key):
+		return self.records[key]
+
+	def save(self, key, record):
+		self.records[key] = record
+		with open(self.progress_path, 'ab') as f:
+			pickle.dump((key, record), f, protocol=pickle.HIGHEST_PROTOCOL)
+			f.flush()
+			os.fsync(f.fileno())
+
+
+class Checkpoint:
+	def __init__(self, output_dir):
+		self.checkpoint_dir = join(output_dir, CHECKPOINT_DIR_NAME)
+		makedirs(self.checkpoint_dir, exist_ok=True)
+
+	def get_phase_path(self, phase):
+		return join(self.checkpoint_dir, phase + ".pkl")
+
+	def is_completed(self, phase):
+		return isfile(self.get_phase_path(phase))
+
+	def load(self, phase):
+		with open(self.get_phase_path(phase), 'rb') as f:
+			return pickle.load(f)
+
+	# Store the result of the phase, keeping the DataFrames and dictionaries as they are
+	def save(self, phase, result):
+		phase_path = self.get_phase_path(phase)
+		with atomic_write(phase_path, "wb") as f:
+			pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+	# Get the universities already completed within the phase
+	def get_progress(self, phase):
+		return PhaseProgress(join(self.checkpoint_dir, phase + ".progress.pkl"))
+
+	# Run the phase unless it was completed before, and store its result
+	def run(self, phase, function, *args):
+		if self.is_completed(phase):
+			print("- Loaded from the checkpoint of the previous run")
+			return self.load(phase)
+
+		result = function(*args)
+		self.save(phase, result)
+		return result
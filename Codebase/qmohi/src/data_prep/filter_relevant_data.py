@@ -3,35 +3,47 @@ Find data relevant to the keywords from the data retrieved from program retrieve
 Input - all data retrieved from the URLs
 Output - data relevant to the keywords
 """
-from nltk.text import Text
 from nltk.stem.snowball import SnowballStemmer
-from nltk.tokenize import sent_tokenize
+from nltk.tokenize import sent_tokenize, wordpunct_tokenize
 from nltk.stem import WordNetLemmatizer
-import nltk.corpus
 import pandas as pd
 import os
+import shutil
 from os import listdir, makedirs
 from os.path import isdir, isfile, join, dirname
 import re
+import io
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
 
 from PyPDF2 import PdfReader
-from tempfile import TemporaryDirectory
 from pdf2image import convert_from_path
-import easyocr
 
-nltk.download('gutenberg')  # Can be run only once in the beginning
+from qmohi.src.data_prep.ocr_engine import get_ocr_engine, configure_ocr_cache, configure_ocr_single_thread
+from qmohi.src.data_prep.keyword_matcher import get_keyword_matcher
+
+# Number of processes extracting text from the cached files, every process loads its own OCR models
+N_PROCESSES = min(4, os.cpu_count() or 1)
 
 
 def get_text_from_image(image_path):
-	# Extract text
-	reader = easyocr.Reader(['en'], verbose=False)
+	# Extract text with the OCR models shared within the process
+	return get_ocr_engine().read_text(image_path)
+
+
+# Load the raw bytes of the image so that OCR results can be looked up by content
+def get_image_bytes(image_link):
 	try:
-		# Consider each segment as a sentence by adding ". "
-		texts = reader.readtext(image_path, detail=0)
+		if isfile(image_link):
+			with open(image_link, "rb") as f:
+				return f.read()
+		request = urllib.request.Request(image_link, headers={'User-Agent': 'Mozilla/5.0'})
+		with urllib.request.urlopen(request, timeout=30) as response:
+			return response.read()
 	except:
-		return ""
-	return ". ".join(texts)
+		return None
 
 
 def get_text_in_images_from_html(html):
@@ -39,6 +51,7 @@ def get_text_in_images_from_html(html):
 	images = soup.find_all('img')
 	text = ""
 	if len(images) > 0:
+		image_links = []
 		for image in images:
 			image_link = ""
 			try:
@@ -56,10 +69,11 @@ def get_text_in_images_from_html(html):
 							pass
 
 			if image_link:
-				try:
-					text += " " + get_text_from_image(image_link)
-				except:
-					pass
+				image_links.append(image_link)
+
+		# Recognize text in all the images of the page together
+		for image_text in get_ocr_engine().read_texts([get_image_bytes(image_link) for image_link in image_links]):
+			text += " " + image_text
 	return text
 
 
@@ -73,12 +87,9 @@ def get_text_from_pdf(pdf_path):
 			images = page.images
 		except:
 			images = []
-		for image in images:
-			with TemporaryDirectory() as tempdir:
-				file_path = join(tempdir, image.name)
-				with open(file_path, "wb") as fp:
-					fp.write(image.data)
-				raw_text += " " + get_text_from_image(file_path)
+		# Recognize text in all the images of the page together
+		for image_text in get_ocr_engine().read_texts([image.data for image in images]):
+			raw_text += " " + image_text
 
 		if raw_text:
 			raw_text = re.sub(r"  +", ". ", raw_text)
@@ -86,41 +97,51 @@ def get_text_from_pdf(pdf_path):
 			text += ". " + raw_text
 
 	if not text:
-		with TemporaryDirectory() as tempdir:
-			# Converting PDF to images
-			pdf_pages = convert_from_path(pdf_path, 500)
-			image_file_list = []
-			for i, page in enumerate(pdf_pages, start=1):
-				file_path = join(tempdir, f"page_{i}.jpg")
-				page.save(file_path, "JPEG")
-				image_file_list.append(file_path)
-
-			# Recognizing text from the images using OCR
-			for image_file in image_file_list:
-				try:
-					text += " " + get_text_from_image(image_file)
-				except:
-					pass
+		# Converting PDF to images
+		pdf_pages = convert_from_path(pdf_path, 500)
+		image_list = []
+		for page in pdf_pages:
+			image_buffer = io.BytesIO()
+			page.save(image_buffer, "JPEG")
+			image_list.append(image_buffer.getvalue())
+
+		# Recognizing text from the images using OCR
+		for image_text in get_ocr_engine().read_texts(image_list):
+			text += " " + image_text
 
 	return text
 
 
-def relevant_content_words(keywords, file):
-	content = Text(nltk.corpus.gutenberg.words(file))
-	tokens = content.tokens
+# Build a positional index of the stemmed tokens
+def build_stem_index(stemmed_tokens):
+	# stem_index is structured as such: {'stem': [index1, index2, index3]}
+	stem_index = {}
+	for i, stemmed_token in enumerate(stemmed_tokens):
+		stem_index.setdefault(stemmed_token, []).append(i)
+	return stem_index
+
+
+# Find the start index of every occurrence of the stemmed phrase in the stemmed tokens
+def find_phrase_offsets(stem_index, stemmed_tokens, stemmed_phrase_list):
+	n_tokens = len(stemmed_tokens)
+	n_phrase_tokens = len(stemmed_phrase_list)
+	offsets = []
+	# Check the following tokens of every occurrence of the first stem in the phrase
+	for i in stem_index.get(stemmed_phrase_list[0], []):
+		if i + n_phrase_tokens <= n_tokens and \
+				all(stemmed_tokens[i + j] == stemmed_phrase_list[j] for j in range(1, n_phrase_tokens)):
+			offsets.append(i)
+	return offsets
+
+
+def relevant_content_words(keywords, contents):
+	# Tokenize the content in memory the same way as the plain text corpus reader
+	tokens = wordpunct_tokenize(" ".join(contents))
 
-	# Concordance referred from https://simplypython.wordpress.com/2014/03/14/saving-output-of-nltk-text-concordance/
 	# Stemming tokens before finding relevant content. Assumption: keywords have/will be been stemmed
 	stemmer = SnowballStemmer("english")
-	# token_stem_dictionary is structured as such: {'stem': [(index, 'non-stemmed-token'),(index, 'non-stemmed-token'),...],...}
-	token_stem_dictionary = {}
-	for i in range(len(tokens)):
-		stemmed_token = stemmer.stem(tokens[i])
-		if stemmed_token in token_stem_dictionary:
-			token_stem_dictionary[stemmed_token].append(tuple([i, tokens[i]]))
-		else:
-			token_stem_dictionary[stemmed_token] = [(i, tokens[i])]
 	stemmed_tokens = [stemmer.stem(token) for token in tokens]
+	stem_index = build_stem_index(stemmed_tokens)
 
 	# Stemming the phrase list for filtering step only
 	# phrase_stem_dictionary is structured as such: {'stem': ['non-stemmed-token', 'non-stemmed-token',...],...}
@@ -138,33 +159,18 @@ def relevant_content_words(keywords, file):
 
 	# found_per_stem_dictionary is structured as such: {'stem': [index1, index2, index3]}
 	found_per_stem_dictionary = {}
-
-	# Keeps track of the keyword index in the content and retrieve the surrounding words
-	c = nltk.ConcordanceIndex(stemmed_tokens, key=lambda s: s.lower())
 	for phrase in phrase_stem_dictionary:
-		stemmed_phrase_list = phrase.split(' ')
-		# Find the offset for each token in the phrase
-		offsets = [c.offsets(x) for x in stemmed_phrase_list]
-		temp_list = offsets[0][:]
-		found_per_stem_dictionary[phrase] = offsets[0][:]
-		for i in range(len(temp_list)):
-			for j in range(1, len(offsets)):
-				if temp_list[i]+j not in offsets[j]:
-					if temp_list[i] in found_per_stem_dictionary[phrase]:
-						found_per_stem_dictionary[phrase].remove(temp_list[i])
-
-		# stem_found_phrase_dictionary is a dictionary structured as such {'stem': ['unstemmed matching phrase1', 'unstemmed matching phrase1']}
-		stem_found_phrase_dictionary = {}
-		for stem in found_per_stem_dictionary:
-			stem_list = stem.split()
-			phrases_list = []
-			for index in found_per_stem_dictionary[stem]:
-				phrase_list = []
-				for i in range(len(stem_list)):
-					phrase_list.append(tokens[index + i])
-				phrase = ' '.join(phrase_list)
-				phrases_list.append(phrase)
-			stem_found_phrase_dictionary[stem] = phrases_list
+		found_per_stem_dictionary[phrase] = find_phrase_offsets(stem_index, stemmed_tokens, phrase.split(' '))
+
+	# stem_found_phrase_dictionary is a dictionary structured as such {'stem': ['unstemmed matching phrase1', 'unstemmed matching phrase1']}
+	stem_found_phrase_dictionary = {}
+	for stem in found_per_stem_dictionary:
+		stem_list = stem.split()
+		phrases_list = []
+		for index in found_per_stem_dictionary[stem]:
+			phrase = ' '.join(tokens[index:index + len(stem_list)])
+			phrases_list.append(phrase)
+		stem_found_phrase_dictionary[stem] = phrases_list
 	return found_per_stem_dictionary, phrase_stem_dictionary, stem_found_phrase_dictionary
 
 
@@ -186,9 +192,6 @@ def sentence_highlight(se_output_file_path, text, keywords, margin):
 	topical_contents = []
 	text = clean_text(text)
 
-	# Open the output file
-	fo_output = open(se_output_file_path, 'a')
-
 	# sent_tokenize() separates sentences by ". "
 	sentences = [sentence for sentence in sent_tokenize(text) if re.search(r"\w", sentence)]
 
@@ -199,8 +202,13 @@ def sentence_highlight(se_output_file_path, text, keywords, margin):
 	MARGIN = 1
 	ANCHOR = 2
 	anchor_sentence_ref = [0] * len(sentences)
-	for i, sentence in enumerate(sentences):
-		if any(keyword.lower() in sentence.lower() for keyword in keywords):
+
+	# Find the keywords in every sentence with a single automaton for all the keywords
+	matcher = get_keyword_matcher(tuple(keywords))
+	sentence_spans = [matcher.find_spans(sentence) for sentence in sentences]
+
+	for i, spans in enumerate(sentence_spans):
+		if spans:
 			for j in range(i-margin, i+margin+1):
 				# Ignore if the index is out of bounds
 				if j < 0 or j >= len(sentences):
@@ -212,158 +220,208 @@ def sentence_highlight(se_output_file_path, text, keywords, margin):
 				elif anchor_sentence_ref[j] != ANCHOR:
 					anchor_sentence_ref[j] = MARGIN
 
-	# Convert the keyword list into regex format
-	re_keywords = "|".join(sorted(keywords, key=len, reverse=True))
-	# Highlight margin and anchor sentences and keywords
-	for i, sentence in enumerate(sentences):
-		sentence += " "
-		# Highlight anchor sentences
-		if anchor_sentence_ref[i] == ANCHOR:
-			cleaned_text = sentence.replace("<br>", "")
-			if cleaned_text:
-				topical_contents.append(cleaned_text)
-			# Find the start and end indices of keywords
-			anchor_word_indices = [(m.start(), m.end()) for m in re.finditer(re_keywords, sentence, re.IGNORECASE)]
-			if anchor_word_indices:
-				anchor_sentence_html = '<span style="background-color:#fff352;">'
-				# Highlight keywords
-				anchor_sentence_cursor = 0
-				for start, end in anchor_word_indices:
-					anchor_sentence_html += sentence[anchor_sentence_cursor:start] + '<b style="color:red;">' + sentence[start:end] + '</b>'
-					anchor_sentence_cursor = end
-				anchor_sentence_html += sentence[end:] + '</span>'
-		# Highlight margin sentences
-		elif anchor_sentence_ref[i] == MARGIN:
-			cleaned_text = sentence.replace("<br>", "")
-			if cleaned_text:
-				topical_contents.append(cleaned_text)
-			anchor_sentence_html = '<span style="background-color:#CEECF5;">' + sentence + '</span>'
-		# Leave other sentences without highlighting
-		else:
-			anchor_sentence_html = sentence
-		# Export into output file
-		fo_output.write(anchor_sentence_html)
+	# Open the output file
+	with open(se_output_file_path, 'a') as fo_output:
+		# Highlight margin and anchor sentences and keywords
+		for i, sentence in enumerate(sentences):
+			sentence += " "
+			# Highlight anchor sentences
+			if anchor_sentence_ref[i] == ANCHOR:
+				cleaned_text = sentence.replace("<br>", "")
+				if cleaned_text:
+					topical_contents.append(cleaned_text)
+				# Find the start and end indices of keywords
+				anchor_word_indices = [(start, end) for start, end, _ in sentence_spans[i]]
+				if anchor_word_indices:
+					anchor_sentence_html = '<span style="background-color:#fff352;">'
+					# Highlight keywords
+					anchor_sentence_cursor = 0
+					for start, end in anchor_word_indices:
+						anchor_sentence_html += sentence[anchor_sentence_cursor:start] + '<b style="color:red;">' + sentence[start:end] + '</b>'
+						anchor_sentence_cursor = end
+					anchor_sentence_html += sentence[end:] + '</span>'
+			# Highlight margin sentences
+			elif anchor_sentence_ref[i] == MARGIN:
+				cleaned_text = sentence.replace("<br>", "")
+				if cleaned_text:
+					topical_contents.append(cleaned_text)
+				anchor_sentence_html = '<span style="background-color:#CEECF5;">' + sentence + '</span>'
+			# Leave other sentences without highlighting
+			else:
+				anchor_sentence_html = sentence
+			# Export into output file
+			fo_output.write(anchor_sentence_html)
 
-	# End the result paragraph and close the file
-	fo_output.write('<br>')
-	fo_output.close()
+		# End the result paragraph
+		fo_output.write('<br>')
 
 	return topical_contents
 
 
-# Collect topical information and highlight it in copies of cached HTML files
-def get_topical_contents(output_dir, university, keywords, margin=5):
-	# Raw topical sentence data to return
-	topical_contents = []
+# Extract the text of a cached file and highlight its topical information in a copy, returning only the topical sentences
+def extract_topical_contents_from_file(cache_file_path, se_output_file_path, keywords, margin):
+	# Extract text
+	if cache_file_path.endswith("pdf"):
+		text = get_text_from_pdf(cache_file_path).encode("ascii", "ignore").decode()
+	else:
+		try:
+			with open(cache_file_path, 'r') as fo_input:
+				html = fo_input.read()
+		except:
+			return []
+
+		bs_obj = BeautifulSoup(html, 'html.parser')
+		text = bs_obj.get_text(". ").encode("ascii", "ignore").decode()
+		text += get_text_in_images_from_html(html)
+
+	# Run sentence highlight, the text of the page is not sent back to the caller
+	makedirs(dirname(se_output_file_path), exist_ok=True)
+	return sentence_highlight(se_output_file_path, text, keywords, margin)
+
+
+# List the cached files of the university along with their sentence extraction output paths
+def get_cache_file_paths(output_dir, university):
+	file_paths = []
 
 	# Specify the path to cache data
 	cache_dir_path = join(output_dir, "saved_webpages")
 	cache_university_path = join(cache_dir_path, university)
 	if isdir(cache_university_path):
 		cache_files = [f for f in listdir(cache_university_path) if isfile(join(cache_university_path, f))]
-		if not cache_files:
-			return topical_contents
 
 		# Specify the sentence extraction output file path
 		se_output_dir_path = join(output_dir, 'sentence_extraction_output')
 		se_output_dir_path = join(se_output_dir_path, university)
-		
-		# Read cache files and extract the anchor sentences
+
 		for cache_file in cache_files:
-			# Specify the path to each cache file
-			cache_file_path = join(cache_university_path, cache_file)
+			file_paths.append((join(cache_university_path, cache_file),
+							   join(se_output_dir_path, os.path.splitext(cache_file)[0] + ".html")))
 
-			# Extract text
-			if cache_file.endswith("pdf"):
-				text = get_text_from_pdf(cache_file_path).encode("ascii", "ignore").decode()
-			else:
-				try:
-					fo_input = open(cache_file_path, 'r')
-					html = fo_input.read()
-				except:
-					continue
-				finally:
-					fo_input.close()
+	return file_paths
 
-				bs_obj = BeautifulSoup(html, 'html.parser')
-				text = bs_obj.get_text(". ").encode("ascii", "ignore").decode()
-				text += get_text_in_images_from_html(html)
 
-			# Run sentence highlight
-			se_output_file_path = join(se_output_dir_path, os.path.splitext(cache_file)[0] + ".html")
-			makedirs(dirname(se_output_file_path), exist_ok=True)
-			topical_contents.extend(sentence_highlight(se_output_file_path, text, keywords, margin))
+# Collect topical information and highlight it in copies of cached HTML files
+def get_topical_contents(output_dir, university, keywords, margin=5):
+	# Raw topical sentence data to return
+	topical_contents = []
+
+	# Read cache files and extract the anchor sentences
+	for cache_file_path, se_output_file_path in get_cache_file_paths(output_dir, university):
+		topical_contents.extend(extract_topical_contents_from_file(cache_file_path, se_output_file_path, keywords, margin))
 
 	return topical_contents
 
 
-def add_space_in_keywords(keywords):
-	return [keyword.replace("-", " - ") for keyword in keywords]
+# Reuse OCR results of the images seen in previous runs in every worker process
+def init_extraction_worker(cache_dir, n_processes):
+	configure_ocr_cache(cache_dir)
+	# Several processes would each take every core for their own copy of the models
+	if n_processes > 1:
+		configure_ocr_single_thread()
 
 
-# Find relevant content from the data provided on the basis of keywords
-def find_relevant_content(input_dataframe, keywords, margin, output_dir):
-	header = ['University name', 'University SHC URL', 'Count of SHC webpages matching keywords',
-			  'Keywords matched webpages on SHC', 'Total word count on all pages', 'Relevant content on all pages']
-	output_dataframe = pd.DataFrame(columns=header)
-	phrase_stem_dictionary = []
-	list_of_found_per_stem_dictionary = []
-	list_of_stem_found_phrase_dictionary = []
+# Collect topical information of all the universities, extracting the cached files in parallel
+def get_topical_contents_of_universities(output_dir, universities, keywords, margin=5, cache_dir=None, n_processes=N_PROCESSES):
+	with ProcessPoolExecutor(max_workers=n_processes, initializer=init_extraction_worker, initargs=(cache_dir, n_processes)) as executor:
+		pending_universities = deque()
 
-	# Add flexibility to keywords
-	lemmatizer = WordNetLemmatizer()
-	keywords.extend([lemmatizer.lemmatize(keyword) for keyword in keywords if lemmatizer.lemmatize(keyword) not in keywords])
-	spaced_keywords = add_space_in_keywords(keywords)
+		for university in universities:
+			# Fan out the cached files of the university across processes
+			futures = [executor.submit(extract_topical_contents_from_file, cache_file_path, se_output_file_path, keywords, margin)
+					   for cache_file_path, se_output_file_path in get_cache_file_paths(output_dir, university)]
+			pending_universities.append((university, futures))
 
-	print("Universities where keywords relevant information was found:")
+			# Keep a bounded number of universities in flight so that finished results do not pile up
+			if len(pending_universities) > 2 * n_processes:
+				yield collect_topical_contents(*pending_universities.popleft())
+
+		while pending_universities:
+			yield collect_topical_contents(*pending_universities.popleft())
+
+
+# Return the topical information of the university in the original order of files
+def collect_topical_contents(university, futures):
+	topical_contents = []
+	for future in futures:
+		topical_contents.extend(future.result())
+	return university, topical_contents
+
+
+def add_space_in_keywords(keywords):
+	return [keyword.replace("-", " - ") for keyword in keywords]
+
+
+# Yield the relevant content of every university as soon as it has been extracted
+def iter_relevant_content(input_dataframe, keywords, spaced_keywords, margin, output_dir, cache_dir=None, n_processes=N_PROCESSES):
+	# Collect topical information of all the universities in parallel
+	universities_contents = get_topical_contents_of_universities(output_dir, input_dataframe['University name'].tolist(), keywords, margin, cache_dir, n_processes)
 
 	# For every university in the dataframe
-	for index, row in input_dataframe.iterrows():
+	for (index, row), (_, contents) in zip(input_dataframe.iterrows(), universities_contents):
 		found_per_stem_dictionary = []
+		phrase_stem_dictionary = []
 		stem_found_phrase_dictionary = []
 		university = row['University name']
-		shc = row['University SHC URL']
-		no_of_links = row['Count of SHC webpages matching keywords']
-		link_data = row['Keywords matched webpages on SHC']
 
 		print("- ", university)
 
-		# Collect topical information
-		contents = get_topical_contents(output_dir, university, keywords, margin)
-
 		if contents:
 			# Calculating total number of words on all web pages
 			total_words = sum(len(content.split()) for content in contents)
 	
-			# Try writing content in the text file
 			try:
-				relevant_content_file = output_dir + "/relevant_content.txt"
-				out_file = open(relevant_content_file, 'w')
-				out_file.write(" ".join(contents))
-				out_file.close()
-
 				# Words_content here is list of lists
-				found_per_stem_dictionary, phrase_stem_dictionary, stem_found_phrase_dictionary = relevant_content_words(spaced_keywords, relevant_content_file)
-
-				# Deleting relevant_file.txt
-				os.remove(relevant_content_file)
+				found_per_stem_dictionary, phrase_stem_dictionary, stem_found_phrase_dictionary = relevant_content_words(spaced_keywords, contents)
 
 			except Exception as e:
 				print(e)
 
-			list_of_found_per_stem_dictionary.append(found_per_stem_dictionary)
-			list_of_stem_found_phrase_dictionary.append(stem_found_phrase_dictionary)
-			output_dataframe = pd.concat([output_dataframe, pd.DataFrame.from_dict({
+			record = {
 				'University name': university,
-				'University SHC URL': shc,
-				'Count of SHC webpages matching keywords': no_of_links,
-				'Keywords matched webpages on SHC': link_data,
+				'University SHC URL': row['University SHC URL'],
+				'Count of SHC webpages matching keywords': row['Count of SHC webpages matching keywords'],
+				'Keywords matched webpages on SHC': row['Keywords matched webpages on SHC'],
 				'Relevant content on all pages': contents,
 				'Total word count on all pages': total_words
-			}, orient='index').transpose()], ignore_index=True)
+			}
+			yield record, found_per_stem_dictionary, phrase_stem_dictionary, stem_found_phrase_dictionary
+
+
+# Find relevant content from the data provided on the basis of keywords
+def find_relevant_content(input_dataframe, keywords, margin, output_dir, cache_dir=None, n_processes=N_PROCESSES):
+	header = ['University name', 'University SHC URL', 'Count of SHC webpages matching keywords',
+			  'Keywords matched webpages on SHC', 'Total word count on all pages', 'Relevant content on all pages']
+	records = []
+	phrase_stem_dictionary = []
+	list_of_found_per_stem_dictionary = []
+	list_of_stem_found_phrase_dictionary = []
+
+	# Add flexibility to keywords
+	lemmatizer = WordNetLemmatizer()
+	keywords.extend([lemmatizer.lemmatize(keyword) for keyword in keywords if lemmatizer.lemmatize(keyword) not in keywords])
+	spaced_keywords = add_space_in_keywords(keywords)
+
+	# Start from scratch if an interrupted run left sentence extraction output behind
+	shutil.rmtree(join(output_dir, 'sentence_extraction_output'), ignore_errors=True)
+
+	# Storing output dataframe row by row as the universities are processed
+	output_file_path = output_dir + '/get_relevant_data_from_collected_data.csv'
+	pd.DataFrame(columns=header).to_csv(output_file_path)
+
+	print("Universities where keywords relevant information was found:")
+
+	for record, found_per_stem_dictionary, university_phrase_stem_dictionary, stem_found_phrase_dictionary in \
+			iter_relevant_content(input_dataframe, keywords, spaced_keywords, margin, output_dir, cache_dir, n_processes):
+		list_of_found_per_stem_dictionary.append(found_per_stem_dictionary)
+		list_of_stem_found_phrase_dictionary.append(stem_found_phrase_dictionary)
+		if university_phrase_stem_dictionary:
+			phrase_stem_dictionary = university_phrase_stem_dictionary
+
+		pd.DataFrame([record], columns=header, index=[len(records)]).to_csv(output_file_path, mode='a', header=False)
+		records.append(record)
 
-	# Storing output dataframe
-	output_dataframe.to_csv(output_dir + '/get_relevant_data_from_collected_data.csv')
+	# Build the output dataframe once from the collected records, the next phases and the checkpoint need all of them
+	output_dataframe = pd.DataFrame(records, columns=header)
 
 	# Returning output dataframe and space added keywords for metric calculation
 	return output_dataframe, spaced_keywords, list_of_found_per_stem_dictionary, phrase_stem_dictionary, list_of_stem_found_phrase_dictionary
@@ -5,46 +5,80 @@ Output - All the links under University SHC containing the given keywords
 """
 
 from qmohi.src.input_parser.input_helper.cse_handler import CSEHandler
+from qmohi.src.input_parser.input_helper.key_scheduler import APIKeysExhaustedError
 import pandas as pd
-import numpy as np
+import sys
 import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Number of custom search queries waiting for a response at the same time
+MAX_QUERY_WORKERS = 8
+
+# Search the SHC website for the keyword query and time it
+def search_links(url_obj, shc, keyword):
+	start_timestamp = datetime.datetime.now()
+	links = url_obj.get_links_by_query(shc, keyword)
+	return links, start_timestamp, datetime.datetime.now()
+
 
 # Get relevant URLs by custom search with keywords and SHC site
-def get_links(input_dataframe, keywords, keys, cse_id, output_dir):
+def get_links(input_dataframe, keywords, key_scheduler, cse_id, output_dir, progress=None, max_workers=MAX_QUERY_WORKERS):
 	header = ['University name', 'University SHC URL', 'Count of SHC webpages matching keywords',
 			  'Keywords matched webpages on SHC', 'start_timestamp', 'end_timestamp']
-	output_dataframe = pd.DataFrame(columns=header)
 
-	# Split dataframe based on calculated number of keys
-	input_dataframe_splitted = np.array_split(input_dataframe, len(keys))
+	# API keys are handed out by the scheduler for every query
+	url_obj = CSEHandler(None, cse_id, key_scheduler)
 
-	# Combine keys with split dataframe
-	for every_split, my_api_key in zip(input_dataframe_splitted, keys):
-		every_split = pd.DataFrame(every_split)
-		i = 0
+	# Rows of the output table, filled in as the queries of each university complete
+	universities = []
+	rows = [None] * len(input_dataframe)
+	results = [None] * len(input_dataframe)
+	remaining = [0] * len(input_dataframe)
 
-		# For every university in the split
-		for index, row in every_split.iterrows():
-			start_timestamp = datetime.datetime.now()
-			output_dataframe_splitted = pd.DataFrame(columns=header)
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		futures = {}
+		for i, (index, row) in enumerate(input_dataframe.iterrows()):
 			university = row['University_name']
 			shc = row['University SHC URL']
-			print("- ", university)
-
-			# If SHC URL was found
-			if shc:
-				url_obj = CSEHandler(my_api_key, cse_id)
-				link_data = []
-				for keyword in keywords:
-					link_data += url_obj.get_links_by_query(shc, keyword)
-				end_timestamp = datetime.datetime.now()
-				output_dataframe_splitted.loc[i] = [university, shc, int(len(link_data)), link_data, start_timestamp, end_timestamp]
-
-			i += 1
-
-			# Concatenating current dataframe with overall result
-			output_dataframe = pd.concat([output_dataframe, output_dataframe_splitted], sort=False)
-			
+			universities.append((university, shc))
+
+			# Reuse the links found before the previous run was interrupted
+			if progress and university in progress:
+				print("- ", university)
+				rows[i] = progress.get(university)
+
+			# If SHC URL was found, search all the keyword groups concurrently
+			elif shc:
+				results[i] = [None] * len(keywords)
+				remaining[i] = len(keywords)
+				for j, keyword in enumerate(keywords):
+					futures[executor.submit(search_links, url_obj, shc, keyword)] = (i, j)
+
+		for future in as_completed(futures):
+			i, j = futures[future]
+			try:
+				results[i][j] = future.result()
+			except APIKeysExhaustedError as e:
+				print("Error in google search : ", e)
+				executor.shutdown(wait=False, cancel_futures=True)
+				sys.exit()
+
+			# Store the university once all its queries are done
+			remaining[i] -= 1
+			if remaining[i] == 0:
+				university, shc = universities[i]
+				print("- ", university)
+				link_data = [link for links, _, _ in results[i] for link in links]
+				start_timestamp = min(start for _, start, _ in results[i])
+				end_timestamp = max(end for _, _, end in results[i])
+				rows[i] = [university, shc, int(len(link_data)), link_data, start_timestamp, end_timestamp]
+				if progress:
+					progress.save(university, rows[i])
+
+	# Universities without SHC URL are left out
+	output_dataframe = pd.DataFrame([row for row in rows if row is not None], columns=header,
+									index=[i for i, row in enumerate(rows) if row is not None])
+
 	# Storing overall results
 	output_dataframe.to_csv(output_dir + '/keywords_matched_webpages_on_SHC.csv')
 
@@ -0,0 +1,85 @@
+"""
+Match many keywords at once with an Aho-Corasick automaton
+Input - list of keywords and the text to search
+Output - positions of the keywords found in the text
+"""
+from collections import deque
+from functools import lru_cache
+
+
+class KeywordMatcher:
+	def __init__(self, keywords):
+		# Keywords are matched literally and case-insensitively
+		self.keywords = sorted(set(keyword.lower() for keyword in keywords if keyword))
+
+		# Trie transitions, failure links and keywords ending at each state
+		self.goto = [{}]
+		self.fail = [0]
+		self.output = [[]]
+		for keyword in self.keywords:
+			self.add_keyword(keyword)
+		self.build_failure_links()
+
+	def add_keyword(self, keyword):
+		state = 0
+		for char in keyword:
+			if char not in self.goto[state]:
+				self.goto.append({})
+				self.fail.append(0)
+				self.output.append([])
+				self.goto[state][char] = len(self.goto) - 1
+			state = self.goto[state][char]
+		self.output[state].append(keyword)
+
+	# Link every state to the longest proper suffix which is also in the trie
+	def build_failure_links(self):
+		queue = deque(self.goto[0].values())
+		while queue:
+			state = queue.popleft()
+			for char, next_state in self.goto[state].items():
+				queue.append(next_state)
+				fail_state = self.fail[state]
+				while fail_state and char not in self.goto[fail_state]:
+					fail_state = self.fail[fail_state]
+				self.fail[next_state] = self.goto[fail_state].get(char, 0)
+				self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+	@staticmethod
+	def lower_text(text):
+		lowered_text = text.lower()
+		# Keep the character positions when lowercasing changes the length of the text
+		if len(lowered_text) != len(text):
+			lowered_text = "".join(char.lower()[0] for char in text)
+		return lowered_text
+
+	# Iterate over (start, end, keyword) of every keyword occurrence, including overlapping ones
+	def iter_matches(self, text):
+		state = 0
+		for i, char in enumerate(self.lower_text(text)):
+			while state and char not in self.goto[state]:
+				state = self.fail[state]
+			state = self.goto[state].get(char, 0)
+			for keyword in self.output[state]:
+				yield i + 1 - len(keyword), i + 1, keyword
+
+	# Check if any keyword occurs in the text
+	def contains_any(self, text):
+		for _ in self.iter_matches(text):
+			return True
+		return False
+
+	# Get (start, end, keyword) of the leftmost longest non-overlapping keyword occurrences
+	def find_spans(self, text):
+		spans = []
+		cursor = 0
+		for start, end, keyword in sorted(self.iter_matches(text), key=lambda match: (match[0], -match[1])):
+			if start >= cursor:
+				spans.append((start, end, keyword))
+				cursor = end
+		return spans
+
+
+# Build the automaton only once for the same set of keywords
+@lru_cache(maxsize=16)
+def get_keyword_matcher(keywords):
+	return KeywordMatcher(keywords)
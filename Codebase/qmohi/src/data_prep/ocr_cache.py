@@ -0,0 +1,110 @@
+"""
+Persistent cache of OCR results
+Input - raw image bytes
+Output - text previously recognized in the same image
+"""
+import hashlib
+import os
+import threading
+from os import listdir, makedirs
+from os.path import getsize, isdir, join
+
+from qmohi.src.atomic_write import atomic_write
+
+# Upper bound of the cached text size in bytes
+OCR_CACHE_MAX_SIZE = 256 * 1024 * 1024
+# Fraction of the size limit kept after an eviction, to avoid evicting on every insert
+OCR_CACHE_EVICTION_RATIO = 0.9
+# Fraction of the size limit written by the process after which the size is measured again on disk,
+# since the other processes sharing the cache write into it too
+OCR_CACHE_RESCAN_RATIO = 0.01
+
+
+class OCRCache:
+	def __init__(self, cache_dir, max_size=OCR_CACHE_MAX_SIZE, namespace="easyocr"):
+		# Results of different OCR engines are kept apart
+		self.cache_dir = join(cache_dir, namespace)
+		makedirs(self.cache_dir, exist_ok=True)
+		self.max_size = max_size
+		self.lock = threading.Lock()
+		self.total_size = self.get_disk_size()
+		# Bytes written by this process since the size was last measured on disk
+		self.unscanned_size = 0
+
+	# Entries are spread over sub-directories named after the first two hash digits
+	def get_entry_path(self, key):
+		return join(self.cache_dir, key[:2], key + ".txt")
+
+	def get_entry_paths(self):
+		entry_paths = []
+		for sub_dir in listdir(self.cache_dir):
+			sub_dir_path = join(self.cache_dir, sub_dir)
+			if isdir(sub_dir_path):
+				entry_paths.extend(join(sub_dir_path, f) for f in listdir(sub_dir_path) if f.endswith(".txt"))
+		return entry_paths
+
+	# Size of all the entries on disk, including the ones written by the other processes
+	def get_disk_size(self):
+		total_size = 0
+		for entry_path in self.get_entry_paths():
+			try:
+				total_size += getsize(entry_path)
+			except OSError:
+				continue
+		return total_size
+
+	@staticmethod
+	def get_key(image_bytes):
+		return hashlib.sha256(image_bytes).hexdigest()
+
+	# Get the text recognized in the image, or None if the image was never seen
+	def get(self, image_bytes):
+		entry_path = self.get_entry_path(self.get_key(image_bytes))
+		try:
+			with open(entry_path, "r") as f:
+				text = f.read()
+			# Mark the entry as recently used for the eviction
+			os.utime(entry_path)
+		except OSError:
+			return None
+		return text
+
+	# Store the text recognized in the image
+	def put(self, image_bytes, text):
+		entry_path = self.get_entry_path(self.get_key(image_bytes))
+		makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+		# Write into a temporary file first so that readers never see a partial entry
+		with atomic_write(entry_path) as f:
+			f.write(text)
+
+		with self.lock:
+			size = getsize(entry_path)
+			self.total_size += size
+			self.unscanned_size += size
+			# The size counted by this process misses the writes of the others, so it is measured on disk from time to time
+			if self.total_size > self.max_size or self.unscanned_size >= self.max_size * OCR_CACHE_RESCAN_RATIO:
+				self.total_size = self.get_disk_size()
+				self.unscanned_size = 0
+			if self.total_size > self.max_size:
+				self.evict()
+
+	# Remove the least recently used entries until the cache fits in the size limit
+	def evict(self):
+		target_size = self.max_size * OCR_CACHE_EVICTION_RATIO
+		entries = []
+		for entry_path in self.get_entry_paths():
+			try:
+				entries.append((os.stat(entry_path).st_mtime, getsize(entry_path), entry_path))
+			except OSError:
+				continue
+
+		self.total_size = sum(size for _, size, _ in entries)
+		for _, size, entry_path in sorted(entries):
+			if self.total_size <= target_size:
+				break
+			try:
+				os.remove(entry_path)
+				self.total_size -= size
+			except OSError:
+				pass
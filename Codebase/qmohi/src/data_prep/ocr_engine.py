@@ -0,0 +1,92 @@
+"""
+Shared OCR engine used for extracting text from images
+Input - image paths, URLs or raw image bytes
+Output - text recognized in the images
+"""
+import threading
+from os.path import join
+import easyocr
+
+from qmohi.src.data_prep.ocr_cache import OCRCache
+
+# Languages recognized by the OCR models
+OCR_LANGUAGES = ['en']
+
+# Process-wide engine, created on first use
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class OCREngine:
+	def __init__(self, languages=OCR_LANGUAGES, cache=None, gpu=True):
+		self.languages = languages
+		self.cache = cache
+		# The models are loaded on the GPU if one is available, unless disabled
+		self.gpu = gpu
+		self.reader = None
+		# The underlying reader is not thread-safe
+		self.lock = threading.Lock()
+
+	# Load the detection and recognition models only once
+	def get_reader(self):
+		if self.reader is None:
+			self.reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False)
+		return self.reader
+
+	# Recognize text in a single image
+	def read_text(self, image):
+		return self.read_texts([image])[0]
+
+	# Recognize text in a batch of images sharing the loaded models
+	def read_texts(self, images):
+		texts = [None] * len(images)
+
+		# Reuse the text recognized in identical images on earlier pages or runs
+		if self.cache:
+			for i, image in enumerate(images):
+				if isinstance(image, bytes):
+					texts[i] = self.cache.get(image)
+
+		with self.lock:
+			for i, image in enumerate(images):
+				if texts[i] is not None:
+					continue
+				# Images which could not be loaded have no text
+				if image is None:
+					texts[i] = ""
+					continue
+				try:
+					# Consider each segment as a sentence by adding ". "
+					texts[i] = ". ".join(self.get_reader().readtext(image, detail=0))
+				except:
+					texts[i] = ""
+					continue
+				if self.cache and isinstance(image, bytes):
+					self.cache.put(image, texts[i])
+		return texts
+
+
+# Get the OCR engine shared within the current process
+def get_ocr_engine():
+	global _engine
+
+	with _engine_lock:
+		if _engine is None:
+			_engine = OCREngine()
+	return _engine
+
+
+# Store the OCR results of the shared engine under the given cache directory
+def configure_ocr_cache(cache_dir):
+	if cache_dir:
+		get_ocr_engine().cache = OCRCache(join(cache_dir, "ocr"))
+
+
+# Run the CPU work of the shared engine on a single thread, for processes running side by side.
+# The models stay on the GPU if there is one, since a single GPU process is faster than several CPU ones
+def configure_ocr_single_thread():
+	import torch
+
+	torch.set_num_threads(1)
+	if not torch.cuda.is_available():
+		get_ocr_engine().gpu = False
@@ -0,0 +1,111 @@
+"""
+Download web pages concurrently
+Input - URLs of the web pages and the paths to save them
+Output - web pages saved on local computer
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# Maximum number of pages downloaded at the same time
+MAX_CONNECTIONS = 16
+# Maximum number of pages downloaded at the same time from the same host
+MAX_CONNECTIONS_PER_HOST = 4
+# Seconds to wait for the server to connect and respond
+TIMEOUT = 30
+# Number of retries after a failed download and the initial wait in seconds, doubled after each retry
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1
+# Responses worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+USER_AGENT = 'Mozilla/5.0'
+
+
+class PageDownloader:
+	def __init__(self, max_connections=MAX_CONNECTIONS, max_connections_per_host=MAX_CONNECTIONS_PER_HOST,
+				 timeout=TIMEOUT, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, page_store=None):
+		self.page_store = page_store
+		self.max_connections = max_connections
+		self.max_connections_per_host = max_connections_per_host
+		self.timeout = timeout
+		self.max_retries = max_retries
+		self.backoff_factor = backoff_factor
+		self.host_semaphores = {}
+		self.host_lock = threading.Lock()
+		self.local = threading.local()
+		# Sessions of all the worker threads, closed with the downloader
+		self.sessions = []
+
+	# Every worker thread keeps its own session to reuse connections
+	def get_session(self):
+		if not hasattr(self.local, "session"):
+			session = requests.Session()
+			adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.max_connections_per_host)
+			session.mount("http://", adapter)
+			session.mount("https://", adapter)
+			session.headers['User-Agent'] = USER_AGENT
+			self.local.session = session
+			with self.host_lock:
+				self.sessions.append(session)
+		return self.local.session
+
+	# Limit the number of concurrent downloads from the same host
+	def get_host_semaphore(self, url):
+		host = urlparse(url).netloc
+		with self.host_lock:
+			if host not in self.host_semaphores:
+				self.host_semaphores[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+			return self.host_semaphores[host]
+
+	# Get the URL, retrying with exponential backoff on connection errors and temporary server errors
+	# If streamed, the body is only downloaded once read, and the caller has to close the response
+	def fetch(self, url, headers=None, stream=False):
+		for attempt in range(self.max_retries + 1):
+			try:
+				with self.get_host_semaphore(url):
+					response = self.get_session().get(url, headers=headers, timeout=self.timeout, stream=stream)
+				if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+					return response
+				response.close()
+			except requests.RequestException:
+				if attempt == self.max_retries:
+					raise
+			time.sleep(self.backoff_factor * 2 ** attempt)
+
+	# Save the web page at the given path
+	def download(self, url, file_path):
+		if self.page_store is None:
+			response = self.fetch(url)
+			response.raise_for_status()
+			with open(file_path, 'wb') as f:
+				f.write(response.content)
+			return
+
+		# Download the page only if it changed since it was stored
+		response = self.fetch(url, headers=self.page_store.get_conditional_headers(url))
+		if response.status_code == 304:
+			self.page_store.refresh(url, response.headers)
+		else:
+			response.raise_for_status()
+			self.page_store.put(url, response.content, response.headers)
+		self.page_store.link(url, file_path)
+
+	# Close the connections of all the sessions
+	def close(self):
+		with self.host_lock:
+			sessions = self.sessions
+			self.sessions = []
+		for session in sessions:
+			session.close()
+
+	# Download all the (url, file_path) pairs concurrently and return the error of each download, if any
+	def download_all(self, downloads):
+		with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+			futures = [executor.submit(self.download, url, file_path) for url, file_path in downloads]
+			errors = [future.exception() for future in futures]
+		# The threads are gone, so are the uses of their sessions
+		self.close()
+		return errors
@@ -0,0 +1,104 @@
+"""
+Persistent store of downloaded web pages shared by all the runs
+Input - URLs along with the downloaded content and response headers
+Output - deduplicated page contents referenced from the run directories
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import datetime
+from os import makedirs
+from os.path import abspath, dirname, isfile, join
+
+from qmohi.src.atomic_write import atomic_write
+
+
+class PageStore:
+	def __init__(self, store_dir):
+		# Contents are stored once per hash, the index maps URLs to contents and cache validators
+		self.blob_dir = join(store_dir, "blobs")
+		self.index_path = join(store_dir, "index.json")
+		makedirs(self.blob_dir, exist_ok=True)
+		self.lock = threading.Lock()
+
+		self.index = {}
+		if isfile(self.index_path):
+			try:
+				with open(self.index_path, 'r') as f:
+					self.index = json.load(f)
+			except (OSError, ValueError) as e:
+				print("Unable to read the web page store index. Error - ", e)
+
+	def get_blob_path(self, content_hash):
+		return join(self.blob_dir, content_hash[:2], content_hash)
+
+	# Get the stored entry of the URL if its content is still available
+	def get_entry(self, url):
+		with self.lock:
+			entry = self.index.get(url)
+		if entry and isfile(self.get_blob_path(entry['hash'])):
+			return entry
+		return None
+
+	# Headers that let the server answer 304 Not Modified when the stored content is still valid
+	def get_conditional_headers(self, url):
+		headers = {}
+		entry = self.get_entry(url)
+		if entry:
+			if entry.get('etag'):
+				headers['If-None-Match'] = entry['etag']
+			if entry.get('last_modified'):
+				headers['If-Modified-Since'] = entry['last_modified']
+		return headers
+
+	# Get the Last-Modified header received for the URL, or None if it was not provided
+	def get_last_modified(self, url):
+		entry = self.get_entry(url)
+		return entry.get('last_modified') if entry else None
+
+	# Store the content downloaded from the URL
+	def put(self, url, content, headers):
+		content_hash = hashlib.sha256(content).hexdigest()
+		blob_path = self.get_blob_path(content_hash)
+
+		# Identical contents are stored only once
+		if not isfile(blob_path):
+			makedirs(dirname(blob_path), exist_ok=True)
+			with atomic_write(blob_path, "wb") as f:
+				f.write(content)
+
+		with self.lock:
+			self.index[url] = {
+				'hash': content_hash,
+				'etag': headers.get('ETag'),
+				'last_modified': headers.get('Last-Modified'),
+				'fetched_at': datetime.datetime.now().isoformat()
+			}
+
+	# Keep the stored content of the URL after the server confirmed that it is unchanged
+	def refresh(self, url, headers):
+		with self.lock:
+			entry = self.index[url]
+			entry['etag'] = headers.get('ETag', entry.get('etag'))
+			entry['last_modified'] = headers.get('Last-Modified', entry.get('last_modified'))
+			entry['fetched_at'] = datetime.datetime.now().isoformat()
+
+	# Make the stored content of the URL available at the given path without copying it
+	def link(self, url, file_path):
+		blob_path = abspath(self.get_blob_path(self.get_entry(url)['hash']))
+		# Replace the file saved by an interrupted run instead of writing through its link
+		if os.path.lexists(file_path):
+			os.remove(file_path)
+		try:
+			os.symlink(blob_path, file_path)
+		except OSError:
+			# Fall back to a copy where symbolic links are not supported
+			shutil.copyfile(blob_path, file_path)
+
+	# Write the index to disk
+	def save(self):
+		with self.lock:
+			with atomic_write(self.index_path) as f:
+				json.dump(self.index, f)
@@ -1,17 +1,20 @@
-import urllib.request
-import urllib.error
-import urllib.parse
 from os import makedirs
 from os.path import join
 
+from qmohi.src.data_prep.page_downloader import PageDownloader
 
-def save_webpage_content(input_dataframe, output_dir):
+
+def save_webpage_content(input_dataframe, output_dir, page_store=None):
 	# Create new directory inside output_directory for saving web pages
 	save_output_path = join(output_dir, "saved_webpages")
-	makedirs(save_output_path)
+	makedirs(save_output_path, exist_ok=True)
 	print(f"Path to the saved web pages: {save_output_path}")
 
-	# For every university
+	# Reuse the web pages stored in previous runs if a page store is given
+	downloader = PageDownloader(page_store=page_store)
+
+	# Collect the web pages of every university
+	downloads = []
 	for _, row in input_dataframe.iterrows():
 		university = row['University name']
 		link_data = row['Keywords matched webpages on SHC']
@@ -23,12 +26,15 @@ def save_webpage_content(input_dataframe, output_dir):
 		makedirs(save_output, exist_ok=True)
 
 		for i in range(len(link_data)):
-			try:
-				opener = urllib.request.build_opener()
-				opener.addheaders = [('User-Agent', 'Mozilla/5.0')] #chromedirver/selenuim
-				urllib.request.install_opener(opener)
-				webpage_index_name = join(save_output, str(i) + '.' + link_data[i]["format"])
-				urllib.request.urlretrieve(link_data[i]["url"], webpage_index_name)
-			except Exception as e:
-				print("Error in saving one of the web page for ", university)
-				print(link_data[i]["url"], " : ", e)
+			webpage_index_name = join(save_output, str(i) + '.' + link_data[i]["format"])
+			downloads.append((university, link_data[i]["url"], webpage_index_name))
+
+	# Download all the web pages concurrently
+	errors = downloader.download_all([(url, webpage_index_name) for _, url, webpage_index_name in downloads])
+	for (university, url, _), e in zip(downloads, errors):
+		if e:
+			print("Error in saving one of the web page for ", university)
+			print(url, " : ", e)
+
+	if page_store:
+		page_store.save()
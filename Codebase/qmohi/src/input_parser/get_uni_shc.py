@@ -4,22 +4,29 @@ Input - list of university names
 Output - list of university SHCs
 """
 
-from googleapiclient.discovery import build
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.common import exceptions
 from selenium.common.exceptions import WebDriverException
 import pandas as pd
-import numpy as np
 import re
 import sys
+import requests
+
+from qmohi.src.browser_pool import get_browser_pool
+from qmohi.src.input_parser.input_helper.cse_handler import CSEHandler
+
+# Number of search results considered when looking for the SHC website
+SHC_SEARCH_RESULTS = 3
+# Seconds to wait for the server when following the redirects of a URL
+REDIRECT_TIMEOUT = 30
+# Bytes at the top of an HTML page searched for a meta refresh or a JavaScript redirect
+REDIRECT_SCAN_SIZE = 64 * 1024
+CLIENT_REDIRECT_PATTERN = re.compile(r'http-equiv\s*=\s*["\']?refresh|(window|document|top)\.location|location\.(href|replace|assign)', re.IGNORECASE)
+USER_AGENT = 'Mozilla/5.0'
 
 
 # Building Google custom search engine
-def google_search(search_term, api_key, cse_id, **kwargs):
+def google_search(search_term, key_scheduler, cse_id, **kwargs):
 	try:
-		service = build("customsearch", "v1", developerKey=api_key)
-		res = service.cse().list(q=search_term, cx=cse_id, **kwargs).execute()
+		res = CSEHandler(None, cse_id, key_scheduler).search(search_term, **kwargs)
 		if('items' in res):
 			return res['items']
 
@@ -28,27 +35,45 @@ def google_search(search_term, api_key, cse_id, **kwargs):
 		sys.exit()
 
 
-# Get redirected URL with the help of headless browser and chrome driver
-def get_redirected_url(url, driver_path):
-	options = Options()
-	options.add_argument("--headless")  # Runs Chrome in headless mode.
+# Follow the HTTP redirects of the URL, or return None if the page may redirect with a meta tag or JavaScript
+def get_http_redirected_url(url):
+	try:
+		with requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=REDIRECT_TIMEOUT, stream=True) as response:
+			# Servers blocking scripts may still serve the page to a browser
+			if response.status_code >= 400:
+				return None
+			if 'html' not in response.headers.get('Content-Type', ''):
+				return response.url
 
-	# Run web driver with the driver_path provided by user
-	driver = webdriver.Chrome(driver_path, chrome_options=options)
+			# The redirecting markup is at the top of the page
+			head = next(response.iter_content(REDIRECT_SCAN_SIZE), b"").decode(response.encoding or 'utf-8', errors='ignore')
+			if CLIENT_REDIRECT_PATTERN.search(head):
+				return None
+			return response.url
 
-	# Try getting redirected URL
-	try:
-		driver.get(url)
-		redirected_url = driver.current_url
+	except requests.RequestException:
+		return None
+
+
+# Get redirected URL, using a headless browser only for the pages redirecting in the browser
+def get_redirected_url(url, driver_path):
+	redirected_url = get_http_redirected_url(url)
+	if redirected_url:
 		return redirected_url
 
+	# Try getting redirected URL with a browser of the pool
+	try:
+		with get_browser_pool(driver_path).browser() as driver:
+			driver.get(url)
+			return driver.current_url
+
 	except WebDriverException as e:
 		print("Web driver exception in selenium :", e.msg)
 
 	# If there is some error in URL redirection
-	except exceptions as e:
+	except Exception as e:
 		print("Error in URL redirection!")
-		print(e.msg)
+		print(e)
 
 	return url
 
@@ -103,58 +128,96 @@ def remove_sub_urls(url):
 	return url
 
 
-# Find SHC URL given the university name
-def get_shc_urls_from_uni_name(input_dataframe, keys, driver_path, cse_id, output_dir):
-	header = ['University_name', 'University SHC URL']
-	output_dataframe = pd.DataFrame(columns=header)
+# Resolve the SHC URL of the university, along with the confidence given by the rank of the search result
+def resolve_shc_url(university, key_scheduler, driver_path, cse_id):
+	# Clean university name, replace special characters with space
+	uni_name = re.sub("[!@#$%^&*()[]{};:,./<>?\|`~-=_+]", " ", university)
 
-	# Split dataframe based on calculated number of keys
-	input_dataframe_splitted = np.array_split(input_dataframe, len(keys))
+	# Construct the queries for the following searches
+	uni_shc = uni_name + " student health center"
+	uni_shc_web = google_search(uni_shc, key_scheduler, cse_id, num=SHC_SEARCH_RESULTS, )
 
-	# Combine keys with split dataframe
-	for every_split, my_api_key in zip(input_dataframe_splitted, keys):
+	if(uni_shc_web is not None):
+	# Check if retrieved URL do not
+		for rank, result in enumerate(uni_shc_web):
+			url = result.get('link', 'none')
 
-		every_split = pd.DataFrame(every_split)
-		i = 0
+			# If url with .edu found
+			if ('.edu' in url) or ('.org' in url):
+				# Get the redirected URL, remove sub-urls and store it in the dataframe
+				redirected_url = get_redirected_url(url, driver_path)
+				sanitized_url = remove_sub_urls(redirected_url)
+				return sanitized_url, (SHC_SEARCH_RESULTS - rank) / SHC_SEARCH_RESULTS
 
-		for index, row in every_split.iterrows():
+	return "", 0
 
-			url_found = 0
 
-			output_dataframe_splitted = pd.DataFrame(columns=header)
+# Get the SHC URL of the university from the cache, resolving it only if it is new or stale
+def get_shc_url(university, key_scheduler, driver_path, cse_id, shc_url_cache=None):
+	if shc_url_cache:
+		entry = shc_url_cache.get(university)
+		if entry:
+			return entry['url']
+
+	url, confidence = resolve_shc_url(university, key_scheduler, driver_path, cse_id)
+	if shc_url_cache:
+		shc_url_cache.put(university, url, confidence)
+	return url
+
+
+# Resolve the SHC URLs of all the universities ahead of the runs
+def prewarm_shc_urls(input_dataframe, key_scheduler, driver_path, cse_id, shc_url_cache):
+	no_of_resolved = 0
+	try:
+		for index, row in input_dataframe.iterrows():
 			university = row["University_name"]
+			if shc_url_cache.get(university):
+				continue
+
 			print("- ", university)
+			url, confidence = resolve_shc_url(university, key_scheduler, driver_path, cse_id)
+			shc_url_cache.put(university, url, confidence)
+			no_of_resolved += 1
+	finally:
+		shc_url_cache.save()
 
-			# Clean university name, replace special characters with space
-			uni_name = re.sub("[!@#$%^&*()[]{};:,./<>?\|`~-=_+]", " ", university)
+	return no_of_resolved
 
-			# Construct the queries for the following searches
-			uni_shc = uni_name + " student health center"
-			uni_shc_web = google_search(uni_shc, my_api_key, cse_id, num=3, )  # consider 3 results
 
-			if(uni_shc_web is not None):
-			# Check if retrieved URL do not
-				for result in uni_shc_web:
-					url = result.get('link', 'none')
+# Find SHC URL given the university name
+def get_shc_urls_from_uni_name(input_dataframe, key_scheduler, driver_path, cse_id, output_dir, progress=None, shc_url_cache=None):
+	header = ['University_name', 'University SHC URL']
+	output_dataframe = pd.DataFrame(columns=header)
+	i = 0
 
-					# If url with .edu found
-					if ('.edu' in url) or ('.org' in url):
-						# Get the redirected URL, remove sub-urls and store it in the dataframe
-						redirected_url = get_redirected_url(url, driver_path)
-						sanitized_url = remove_sub_urls(redirected_url)
+	try:
+		for index, row in input_dataframe.iterrows():
 
-						output_dataframe_splitted.loc[i] = [university, sanitized_url]
-						url_found = 1
-						break
+			output_dataframe_splitted = pd.DataFrame(columns=header)
+			university = row["University_name"]
+			print("- ", university)
+
+			# Reuse the SHC URL found before the previous run was interrupted
+			if progress and university in progress:
+				url = progress.get(university)
 
-			if url_found == 0:
-				print("   - University SHC website not found!")
-				output_dataframe_splitted.loc[i] = [university, ""]
+			else:
+				url = get_shc_url(university, key_scheduler, driver_path, cse_id, shc_url_cache)
+				if not url:
+					print("   - University SHC website not found!")
+				if progress:
+					progress.save(university, url)
 
+			output_dataframe_splitted.loc[i] = [university, url]
 			i = i + 1
 
 			output_dataframe = pd.concat([output_dataframe, output_dataframe_splitted], sort=False)
 
+	finally:
+		# Keep the URLs resolved so far even if the run is interrupted
+		if shc_url_cache:
+			shc_url_cache.save()
+
 	# Store result in output directory
 	output_dataframe.to_csv(output_dir + '/University_SHC.csv')
 
@@ -5,6 +5,7 @@ import re
 from nltk.stem import WordNetLemmatizer
 
 from qmohi.src.input_parser.input_helper.cse_handler import CSEHandler
+from qmohi.src.input_parser.input_helper.key_scheduler import APIKeyScheduler, APIKeysExhaustedError
 
 import asyncio
 import pyppeteer
@@ -325,9 +326,19 @@ def sort_drugs(drugs, keywords):
     return [drug for relevant_drug in relevant_drugs for drug in relevant_drug] + other_drugs
 
 
+# Get links containing the term, without any link once all the API keys are exhausted
+def search_links(search_obj, url, term):
+    try:
+        return search_obj.get_links_by_query(url, term)
+    # The comparison document is built from the terms searched so far
+    except APIKeysExhaustedError as e:
+        print("Caught exception for Custom Search engine!", e)
+        return []
+
+
 def generate_comparison_document(output_file_path, api_keys, cse_id, depth, num_of_therapy=5, keywords=[], drug_details=True):
-    # Instanciate the CSE handler
-    search_obj = CSEHandler(api_keys[0], cse_id)
+    # Instanciate the CSE handler, failing over across all the given keys
+    search_obj = CSEHandler(api_keys[0], cse_id, APIKeyScheduler(api_keys))
 
     # Open the output file
     makedirs(dirname(output_file_path), exist_ok=True)
@@ -338,7 +349,7 @@ def generate_comparison_document(output_file_path, api_keys, cse_id, depth, num_
 
     for i, keyword in enumerate(keywords):
         print(f"   Search Term: {keyword}")
-        links = search_obj.get_links_by_query(MEDLINEPLUS_URL, keyword)
+        links = search_links(search_obj, MEDLINEPLUS_URL, keyword)
         links = [link["url"] for link in links]
         # print(links)
 
@@ -357,7 +368,7 @@ def generate_comparison_document(output_file_path, api_keys, cse_id, depth, num_
         lemmatized_keyword = lemmatize_word(keyword)
         if lemmatized_keyword != keyword:
             query += ' OR "' + lemmatized_keyword + '"'
-        links = search_obj.get_links_by_query(MEDLINEPLUS_DRUGS_URL, query)
+        links = search_links(search_obj, MEDLINEPLUS_DRUGS_URL, query)
         links = [link["url"] for link in links]
         # print(links)
         for link in links:
@@ -365,7 +376,7 @@ def generate_comparison_document(output_file_path, api_keys, cse_id, depth, num_
                 get_comparison_document(output_file, link, 1, visited_urls, drug_keywords, drug_details)
 
         # DrugBank Information on DrugBank
-        therapy_links = search_obj.get_links_by_query(DRUGBANK_URL, query)
+        therapy_links = search_links(search_obj, DRUGBANK_URL, query)
         therapy_links = [link["url"] for link in therapy_links]
         for link in therapy_links[:min(len(therapy_links), num_of_therapy)]:
             link = re.sub(r"(DB\d+)/.*", r"\1", link)
@@ -0,0 +1,54 @@
+"""
+Persistent cache of Google custom search results
+Input - search query along with the custom search engine id and the search parameters
+Output - response previously received for the same query
+"""
+import hashlib
+import json
+import time
+from os import makedirs
+from os.path import dirname, join
+
+from qmohi.src.atomic_write import atomic_write
+
+# Seconds for which a cached response is used instead of querying again
+CSE_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+class CSECache:
+	def __init__(self, cache_dir, ttl=CSE_CACHE_TTL):
+		self.cache_dir = cache_dir
+		makedirs(self.cache_dir, exist_ok=True)
+		self.ttl = ttl
+
+	# Entries are spread over sub-directories named after the first two hash digits
+	def get_entry_path(self, key):
+		return join(self.cache_dir, key[:2], key + ".json")
+
+	@staticmethod
+	def get_key(query, cse_id, **kwargs):
+		# The API key does not change the results, so it is not a part of the key
+		return hashlib.sha256(json.dumps([query, cse_id, kwargs], sort_keys=True).encode("utf-8")).hexdigest()
+
+	# Get the response received for the query, or None if it was never made or has expired
+	def get(self, query, cse_id, **kwargs):
+		entry_path = self.get_entry_path(self.get_key(query, cse_id, **kwargs))
+		try:
+			with open(entry_path, "r") as f:
+				entry = json.load(f)
+		except (OSError, ValueError):
+			return None
+
+		if time.time() - entry['fetched_at'] > self.ttl:
+			return None
+		return entry['response']
+
+	# Store the response received for the query
+	def put(self, query, cse_id, response, **kwargs):
+		entry_path = self.get_entry_path(self.get_key(query, cse_id, **kwargs))
+		makedirs(dirname(entry_path), exist_ok=True)
+		entry = {'query': query, 'cx': cse_id, 'params': kwargs, 'fetched_at': time.time(), 'response': response}
+
+		# Write to a temporary file first so that concurrent readers never see a partial entry
+		with atomic_write(entry_path) as f:
+			json.dump(entry, f)
@@ -1,11 +1,126 @@
 from googleapiclient.discovery import build
-import json
+from googleapiclient.errors import HttpError
+from os.path import join
+import threading
 import time
 
+from qmohi.src.input_parser.input_helper.cse_cache import CSECache, CSE_CACHE_TTL
+from qmohi.src.input_parser.input_helper.key_scheduler import APIKeyScheduler, APIKeysExhaustedError, QUOTA_STATUS_CODES
+
+# Maximum number of queries sent to the custom search API per second with the same API key
+QUERIES_PER_SECOND = 1
+# Number of queries that can be sent at once after being idle
+QUERY_BURST = 1
+# Number of times a query is sent again after a server error of the custom search API
+SERVER_ERROR_RETRIES = 5
+# Seconds to wait before sending the query again after the first server error, doubled after every other one
+SERVER_ERROR_BACKOFF = 2
+
+
+# Token bucket limiting the rate of the queries sent by all the threads of the process with an API key
+class RateLimiter:
+	def __init__(self, rate=QUERIES_PER_SECOND, burst=QUERY_BURST):
+		self.rate = rate
+		self.burst = burst
+		self.tokens = burst
+		self.updated_at = time.monotonic()
+		self.lock = threading.Lock()
+
+	# Wait until a query can be sent
+	def acquire(self):
+		while True:
+			with self.lock:
+				now = time.monotonic()
+				self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+				self.updated_at = now
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+				wait = (1 - self.tokens) / self.rate
+			time.sleep(wait)
+
+
+rate_limiters = {}
+rate_limiters_lock = threading.Lock()
+
+# Custom search results cache shared by the process, disabled until configured
+cse_cache = None
+
+# Address of the custom search API, the Google endpoint is used if not set
+cse_api_endpoint = None
+
+# Discovery clients are not thread safe, so every thread keeps one client per API key
+local = threading.local()
+
+
+# Store the custom search results under the cache directory
+def configure_cse_cache(cache_dir, ttl=CSE_CACHE_TTL):
+	global cse_cache
+	if cache_dir:
+		cse_cache = CSECache(join(cache_dir, "cse"), ttl)
+
+
+# Send the queries to another server implementing the custom search API, e.g. a local fake endpoint for benchmarks
+def configure_cse_endpoint(api_endpoint):
+	global cse_api_endpoint
+	cse_api_endpoint = api_endpoint
+
+
+def get_rate_limiter(api_key):
+	with rate_limiters_lock:
+		if api_key not in rate_limiters:
+			rate_limiters[api_key] = RateLimiter()
+		return rate_limiters[api_key]
+
+
+# Get the custom search client of the API key, building it only once per thread
+def get_service(api_key):
+	if not hasattr(local, "services"):
+		local.services = {}
+	if api_key not in local.services:
+		client_options = {"api_endpoint": cse_api_endpoint} if cse_api_endpoint else None
+		local.services[api_key] = build("customsearch", "v1", developerKey=api_key, cache_discovery=False,
+										client_options=client_options)
+	return local.services[api_key]
+
+
 class CSEHandler:
-	def __init__(self, api_key, cse_id):
+	def __init__(self, api_key, cse_id, key_scheduler=None):
 		self.api_key = api_key
 		self.cse_id = cse_id
+		# Queries are spread over the keys of the scheduler if one is given, otherwise they all use the given key
+		self.key_scheduler = key_scheduler if key_scheduler else APIKeyScheduler([api_key])
+
+	# Get the response of the custom search for the query, from the cache if it was made before
+	def search(self, query, **kwargs):
+		if cse_cache:
+			response = cse_cache.get(query, self.cse_id, **kwargs)
+			if response is not None:
+				return response
+
+		# Fail over to the next key when the API refuses the current one
+		server_errors = 0
+		while True:
+			api_key = self.key_scheduler.acquire()
+			get_rate_limiter(api_key).acquire()
+			try:
+				response = get_service(api_key).cse().list(q=query, cx=self.cse_id, **kwargs).execute()
+			except HttpError as e:
+				if e.resp.status in QUOTA_STATUS_CODES:
+					self.key_scheduler.report_error(api_key, e.resp.status)
+					continue
+				# Server errors are transient and do not tell anything about the key, so the query is sent again later
+				if e.resp.status >= 500 and server_errors < SERVER_ERROR_RETRIES:
+					time.sleep(SERVER_ERROR_BACKOFF * 2 ** server_errors)
+					server_errors += 1
+					continue
+				# Other client errors are caused by the query itself and would fail with every key
+				raise
+			break
+
+		if cse_cache:
+			cse_cache.put(query, self.cse_id, response, **kwargs)
+		return response
 
 	# Get links containing the term
 	def get_links_by_query(self, url, term):
@@ -15,18 +130,8 @@ class CSEHandler:
 		query = term + " site:" + url
 
 		# Google API custom search service
-		time.sleep(1)
 		try:
-			service = build("customsearch", "v1", developerKey=self.api_key)
-			response = service.cse().list(
-				q=query,
-				cx=self.cse_id,
-				lr='lang_en',
-			).execute()
-			
-			# Output received in the form of json
-			with open('data.json', 'w') as outfile:
-				json.dump(response, outfile)
+			response = self.search(query, lr='lang_en')
 
 			# Items contain all the retrieved results
 			if 'items' in response:
@@ -40,10 +145,14 @@ class CSEHandler:
 						continue
 					else:
 						content_format = 'html'
-					
+
 					# Links from the items contain URLs
 					links.append({'url': item['link'], 'format': content_format})
 
+		# No query can be made anymore, let the caller stop instead of recording empty results
+		except APIKeysExhaustedError:
+			raise
+
 		except Exception as e:
 			print("Caught exception for Custom Search engine!", e)
 
@@ -0,0 +1,117 @@
+"""
+Hand out Google API keys to the custom search queries
+Input - list of Google API keys, and the file counting their queries of the day
+Output - key with the most remaining daily quota for every query
+"""
+import datetime
+import hashlib
+import json
+import threading
+from os import makedirs
+from os.path import dirname, isfile
+
+from qmohi.src.atomic_write import atomic_write
+
+# Number of free custom search queries per API key and day
+DAILY_QUERY_LIMIT = 100
+# Number of custom search queries per paid API key and day
+PAID_DAILY_QUERY_LIMIT = 10000
+# Responses telling that the daily quota of the key is used up or that the key is not allowed to search
+QUOTA_STATUS_CODES = {403, 429}
+# File of the cache directory counting the queries of the day per key
+API_KEY_USAGE_FILE_NAME = "api_key_usage.json"
+
+
+class APIKeysExhaustedError(Exception):
+	pass
+
+
+# Name of the key in the usage file, so that the key itself is not written to disk
+def get_key_id(key):
+	return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class APIKeyScheduler:
+	def __init__(self, keys, daily_limit=DAILY_QUERY_LIMIT, usage_path=None):
+		# Keep the order given by the user and ignore repeated keys
+		self.keys = list(dict.fromkeys(keys))
+		self.daily_limit = daily_limit
+		# Queries of the day are counted in the usage file if one is given, so that the next runs of the day start from them
+		self.usage_path = usage_path
+		self.date = datetime.date.today().isoformat()
+		self.used = {key: 0 for key in self.keys}
+		self.disabled = set()
+		self.lock = threading.Lock()
+		self.load_usage()
+
+	# Read the number of queries sent today with every key
+	def load_usage(self):
+		if not self.usage_path or not isfile(self.usage_path):
+			return
+		try:
+			with open(self.usage_path, "r") as f:
+				usage = json.load(f)
+		except (OSError, ValueError) as e:
+			print("Unable to read the API key usage. Error - ", e)
+			return
+
+		# The counts of the previous days do not use today's quota
+		if usage.get("date") != self.date:
+			return
+		for key in self.keys:
+			self.used[key] = usage.get("used", {}).get(get_key_id(key), 0)
+
+	# Write the number of queries sent today with every key, keeping the keys of the other runs
+	def save_usage(self):
+		if not self.usage_path:
+			return
+		used = {}
+		if isfile(self.usage_path):
+			try:
+				with open(self.usage_path, "r") as f:
+					usage = json.load(f)
+				if usage.get("date") == self.date:
+					used = usage.get("used", {})
+			except (OSError, ValueError):
+				pass
+		used.update({get_key_id(key): count for key, count in self.used.items()})
+
+		try:
+			makedirs(dirname(self.usage_path), exist_ok=True)
+			with atomic_write(self.usage_path) as f:
+				json.dump({"date": self.date, "used": used}, f)
+		except OSError as e:
+			print("Unable to store the API key usage. Error - ", e)
+
+	# Get the key with the most remaining quota and count the query against it
+	def acquire(self):
+		with self.lock:
+			# The counts start again on the next day
+			today = datetime.date.today().isoformat()
+			if today != self.date:
+				self.date = today
+				self.used = {key: 0 for key in self.keys}
+
+			available_keys = [key for key in self.keys if key not in self.disabled and self.used[key] < self.daily_limit]
+			if not available_keys:
+				raise APIKeysExhaustedError("The daily quota of all the Google API keys is used up")
+
+			key = min(available_keys, key=lambda k: self.used[k])
+			self.used[key] += 1
+			self.save_usage()
+			return key
+
+	def get_remaining_quota(self, key):
+		with self.lock:
+			if key in self.disabled:
+				return 0
+			return max(self.daily_limit - self.used[key], 0)
+
+	# Stop using the key if the API refused it because its quota is used up or it is not allowed to search
+	def report_error(self, key, status):
+		if status not in QUOTA_STATUS_CODES:
+			return
+		with self.lock:
+			if key not in self.disabled:
+				print("   - Google API key ending with", key[-4:], "is no longer used")
+			self.disabled.add(key)
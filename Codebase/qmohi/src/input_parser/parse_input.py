@@ -1,8 +1,13 @@
 import sys
 import datetime
 import os
+import math
 import pandas as pd
 from qmohi.src.input_parser.input_helper.keyword_suggestion_helper import KeywordSuggestionHelper
+from qmohi.src.input_parser.input_helper.key_scheduler import DAILY_QUERY_LIMIT, PAID_DAILY_QUERY_LIMIT
+
+# Queries planned per free API key and day, below the daily limit to keep a margin for retries
+PLANNED_QUERIES_PER_KEY = 90
 
 def read_input_file(path):
 	# Read the content from user's input file
@@ -47,6 +52,46 @@ def set_output_directory(file):
 	return output_dir
 
 
+def set_resume_directory(output_dir):
+	# Output directory of the interrupted run to continue
+	if not os.path.isdir(output_dir) or not os.access(output_dir, os.W_OK):
+		print(output_dir)
+		print("Either provided output directory to resume do not exist or it do not have write access for this program!")
+		sys.exit()
+
+	return output_dir.rstrip('/')
+
+
+def set_cache_directory(output_dir):
+	# Cached data is shared by all the runs stored in the same output directory
+	cache_dir = os.path.join(os.path.dirname(output_dir), 'Cache')
+	os.makedirs(cache_dir, exist_ok=True)
+
+	return cache_dir
+
+
+def get_input_cache_directory(file):
+	# Cache directory inside the output directory given by user, without starting a new run
+	output_dir = file[['Output_directory']].copy()
+	# Dropping rows with NaN values
+	output_dir = output_dir.dropna(axis=0, how='any')
+
+	if output_dir.empty:
+		print("Please provide output directory to store the results!")
+		sys.exit()
+
+	output_dir = output_dir['Output_directory'].values[0]
+	if not os.access(output_dir, os.W_OK):
+		print(output_dir)
+		print("Either provided output directory do not exist or it do not have write access for this program!")
+		sys.exit()
+
+	cache_dir = os.path.join(output_dir, 'Cache')
+	os.makedirs(cache_dir, exist_ok=True)
+
+	return cache_dir
+
+
 def get_input_university_names(file):
 	# Reading university names provided by user
 	universities_list = file[['University_name']].copy()
@@ -142,14 +187,22 @@ def divide_query_keywords(keyword_list):
 
 def calculate_num_keys_required(no_of_universities, num_of_words):
 	# Assuming daily limit of 90 queries per API key just to be on safer side
-	# + 1 because one of the keys used for keyword suggestion
-	no_of_keys_for_shc = (no_of_universities // 90)
+	# One query per university to find the SHC website
+	no_of_keys_for_shc = math.ceil(no_of_universities / PLANNED_QUERIES_PER_KEY)
 
-	# Assuming daily limit of 90 queries per API key and maximum 6 words in university name
-	no_of_keys_for_site_specific_search = ((((num_of_words // 26) + 1) * no_of_universities) // 90) + 1
+	# One query per university for every group of at most 26 keyword words
+	# + 1 because one of the keys used for keyword suggestion
+	no_of_keys_for_site_specific_search = math.ceil((((num_of_words // 26) + 1) * no_of_universities) / PLANNED_QUERIES_PER_KEY) + 1
 	return no_of_keys_for_shc, no_of_keys_for_site_specific_search
 
 
+# Daily number of queries of the input API keys, paid keys have a larger quota
+def get_input_daily_query_limit(file):
+	if file[['Paid_API_key']].dropna(axis=0, how='any').Paid_API_key.count() > 0:
+		return PAID_DAILY_QUERY_LIMIT
+	return DAILY_QUERY_LIMIT
+
+
 def get_input_api_keys(file, no_of_keys_for_shc, no_of_keys_for_site_specific_search, force_pass=False):
 	# Reading API keys provided by user
 	keys = file[['Paid_API_key']].copy()
@@ -0,0 +1,60 @@
+"""
+Persistent cache of the SHC websites resolved for the universities
+Input - university names
+Output - SHC URLs resolved in previous runs, along with the time of resolution and the confidence
+"""
+import datetime
+import json
+import threading
+from os.path import isfile
+
+from qmohi.src.atomic_write import atomic_write
+
+# Days after which the SHC URL of a university is resolved again
+SHC_URL_REFRESH_AGE = 30
+# Hours after which a university whose SHC URL was not found is resolved again, as the search may have failed temporarily
+SHC_URL_NOT_FOUND_REFRESH_AGE = 12
+
+
+class SHCURLCache:
+	def __init__(self, cache_path, refresh_age=SHC_URL_REFRESH_AGE, not_found_refresh_age=SHC_URL_NOT_FOUND_REFRESH_AGE):
+		self.cache_path = cache_path
+		self.refresh_age = datetime.timedelta(days=refresh_age)
+		self.not_found_refresh_age = datetime.timedelta(hours=not_found_refresh_age)
+		self.lock = threading.Lock()
+
+		self.entries = {}
+		if isfile(cache_path):
+			try:
+				with open(cache_path, 'r') as f:
+					self.entries = json.load(f)
+			except (OSError, ValueError) as e:
+				print("Unable to read the SHC URL cache. Error - ", e)
+
+	# Get the entry of the university if it was resolved within the refresh age, which is shorter if the URL was not found
+	def get(self, university):
+		with self.lock:
+			entry = self.entries.get(university)
+		if entry is None:
+			return None
+
+		refresh_age = self.refresh_age if entry['url'] and entry['confidence'] > 0 else self.not_found_refresh_age
+		resolved_at = datetime.datetime.fromisoformat(entry['resolved_at'])
+		if datetime.datetime.now() - resolved_at > refresh_age:
+			return None
+		return entry
+
+	# Store the SHC URL resolved for the university, an empty URL means that it was not found
+	def put(self, university, url, confidence):
+		with self.lock:
+			self.entries[university] = {
+				'url': url,
+				'resolved_at': datetime.datetime.now().isoformat(),
+				'confidence': confidence
+			}
+
+	# Write the cache to disk
+	def save(self):
+		with self.lock:
+			with atomic_write(self.cache_path) as f:
+				json.dump(self.entries, f, indent=4, sort_keys=True)
@@ -2,16 +2,19 @@ import pandas as pd
 from textblob import TextBlob
 import requests
 import re
+from os.path import join
 from urllib.parse import urlparse
-from qmohi.src.metric_calc.navigation_metric.counter import get_min_click_count
+from qmohi.src.metric_calc.navigation_metric.runner import get_navigation_of_universities
 from gensim.models import KeyedVectors
 from gensim.test.utils import datapath
 
 from qmohi.src.metric_calc.similarity_metric.similarity import Similarity
+from qmohi.src.metric_calc.similarity_metric.word_vector_store import WordVectorStore, is_word_vector_store
 
 class University:
 
-	def __init__(self, uni_name, shc_url, content, links, no_of_links):
+	def __init__(self, uni_name, shc_url, content, links, no_of_links, page_store=None):
+		self.page_store = page_store
 		self.uni_name = uni_name
 		self.shc_url = shc_url
 		self.content = content
@@ -40,6 +43,12 @@ class University:
 		for url in self.links:
 			result = urlparse(url)
 
+			# Use the Last-Modified header received when the web page was stored
+			if self.page_store and self.page_store.get_entry(url):
+				last_modified = self.page_store.get_last_modified(url)
+				timeliness.append(last_modified if last_modified else -1)
+				continue
+
 			try:
 				if True if [result.scheme, result.netloc, result.path] else False:
 					header = requests.head(url).headers
@@ -59,26 +68,15 @@ class University:
 
 		return timeliness
 
-	def calculate_similarity(self, word_vector, comparison_doc_path):
-		# Load the comparison document
-		file = open(comparison_doc_path)
-		comparison_content = file.read()
-		file.close()
-
-		# Calculate similarity
-		similarity_obj = Similarity(word_vector)
-		similarity, similarity_label = similarity_obj.calculate_similarity(comparison_content, self.content)
+	def calculate_similarity(self, similarity_obj, comparison_content, tfidf_stopword_dir=None):
+		# The stopwords found by TF-IDF are exported per university if a directory is given
+		tfidf_stopword_file_path = join(tfidf_stopword_dir, self.uni_name + ".txt") if tfidf_stopword_dir else None
+		# The Similarity object is shared by the universities, so the comparison document is prepared once
+		similarity, similarity_label = similarity_obj.calculate_similarity(comparison_content, self.content, tfidf_stopword_file_path=tfidf_stopword_file_path)
 		return round(similarity, 3), similarity_label
 
-	def calculate_navigation(self, driver_path):
 
-		min_clicks, trace = get_min_click_count(self.no_of_links, self.links, self.shc_url, driver_path)
-		if min_clicks == (999, []):
-			return -1, []
-		return min_clicks, trace
-
-
-def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_path, model_path):
+def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_path, model_path, page_store=None, progress=None, cache_dir=None, tfidf_stopword_dir=None):
 
 	header = ['University name', 'Count of SHC webpages matching keywords', 'Keywords matched webpages on SHC',
 			  'Content on all pages', 'Similarity Score', 'Similarity Label', 'Sentiment objectivity', 'Sentiment polarity', 'Timeliness',
@@ -88,11 +86,29 @@ def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_p
 	# If the model_path is 0, that means a model was not provided. Old method for similarity will be used.
 	if (model_path != 0):
 		print("Loading model...")
-		wv = KeyedVectors.load_word2vec_format(datapath(model_path), binary=True)
+		# A converted word vector store is memory-mapped, a word2vec binary model has to be parsed
+		if is_word_vector_store(model_path):
+			wv = WordVectorStore(model_path)
+		else:
+			wv = KeyedVectors.load_word2vec_format(datapath(model_path), binary=True)
 		print("Loaded")
 
+	# Load the comparison document
+	with open(comparison_doc_path) as file:
+		comparison_content = file.read()
+	similarity_obj = Similarity(wv, cache_dir)
+
+	# Crawl the SHC websites of the universities in worker processes while the other metrics are calculated,
+	# reusing the link graphs of the websites crawled in previous runs
+	navigation_results = get_navigation_of_universities([
+		None if progress and row['University name'] in progress else
+		(row['University name'], row['Count of SHC webpages matching keywords'],
+		 [data["url"] for data in row['Keywords matched webpages on SHC']], row['University SHC URL'])
+		for index, row in input_dataframe.iterrows()], driver_path, cache_dir)
+
 	for index, row in input_dataframe.iterrows():
 
+		navigation_result = next(navigation_results)
 		uni_name = row['University name']
 		no_of_links = row['Count of SHC webpages matching keywords']
 		link_data = row['Keywords matched webpages on SHC']
@@ -101,10 +117,15 @@ def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_p
 		shc_url = row['University SHC URL']
 		print("\n- ", uni_name)
 
-		obj = University(uni_name, shc_url, " ".join(contents), links, no_of_links)
+		# Reuse the metrics calculated before the previous run was interrupted
+		if progress and uni_name in progress:
+			output_dataframe = pd.concat([output_dataframe, pd.DataFrame.from_dict(progress.get(uni_name), orient='index').transpose()], ignore_index=True)
+			continue
+
+		obj = University(uni_name, shc_url, " ".join(contents), links, no_of_links, page_store)
 
 		print("   - Similarity")
-		similarity, similarity_label = obj.calculate_similarity(wv, comparison_doc_path)
+		similarity, similarity_label = obj.calculate_similarity(similarity_obj, comparison_content, tfidf_stopword_dir)
 
 		print("   - Objectivity")
 		sentiment_objectivity = obj.calculate_sentiment_objectivity()
@@ -115,10 +136,10 @@ def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_p
 		print("   - Timeliness")
 		timeliness = obj.calculate_timeliness()
 
-		print("   - Navigation")
-		navigation, trace = obj.calculate_navigation(driver_path)
-		
-		output_dataframe = pd.concat([output_dataframe, pd.DataFrame.from_dict({
+		navigation, trace, navigation_details = navigation_result
+		print("   - Navigation:", navigation_details)
+
+		output_row = {
 			'University name': uni_name,
 			'Count of SHC webpages matching keywords': no_of_links,
 			'Keywords matched webpages on SHC': row['Keywords matched webpages on SHC'],
@@ -130,7 +151,11 @@ def calculate_metrics(input_dataframe, output_dir, comparison_doc_path, driver_p
 			'Timeliness': timeliness,
 			'Navigation': navigation,
 			'Trace': trace
-		}, orient='index').transpose()], ignore_index=True)
+		}
+		if progress:
+			progress.save(uni_name, output_row)
+
+		output_dataframe = pd.concat([output_dataframe, pd.DataFrame.from_dict(output_row, orient='index').transpose()], ignore_index=True)
 		
 	# Storing output
 	output_dataframe.to_csv(output_dir + '/measures_result.csv')
@@ -1,6 +1,5 @@
-mode = "--headless"
 LEVEL_THRESHOLD = 10
-INVALID_CLICKS = 999
 n_processes = 4
-visited_urls = []
-trace = []
\ No newline at end of file
+# Budget of a single website, the crawl gives up beyond it so that one huge site does not stall the run
+MAX_PAGES_PER_SITE = 2000
+MAX_SECONDS_PER_SITE = 600
@@ -0,0 +1,105 @@
+"""
+State of the breadth first search of a website for the navigation metric
+Input - SHC URL, target URLs and the crawler fetching the web pages
+Output - minimum number of clicks from the SHC URL to a target URL and the trace of the clicks
+"""
+import time
+import qmohi.src.metric_calc.navigation_metric.constants as constants
+
+
+class CrawlState:
+
+    def __init__(self, root_url, target_urls, crawler, level_threshold=constants.LEVEL_THRESHOLD,
+                 max_pages=constants.MAX_PAGES_PER_SITE, max_seconds=constants.MAX_SECONDS_PER_SITE, verbose=True):
+        self.root_url = root_url
+        self.target_urls = target_urls
+        self.crawler = crawler
+        self.level_threshold = level_threshold
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.verbose = verbose
+        self.started_at = time.monotonic()
+        self.budget_exceeded = False
+        # Every crawl keeps its own state so that several crawls can run at the same time
+        self.visited = {root_url}
+        self.parents = {root_url: None}
+        self.frontier = [root_url]
+        self.level = 0
+
+    # Get the hyperlinks of the web page that were not visited yet, marking them as visited
+    def get_child_pages(self, url):
+        child_pages = []
+        _, links = self.crawler.get_page(url)
+
+        for next_url in links:
+            # Spilt URL wtih # to remove unwanted part
+            next_url = next_url.rsplit('#', 1)[0]
+
+            # 1st condition for checking if root url is a substring of next url
+            # 2nd condition for checking if next url is already present in the visited urls or no
+            # 3rd condition for checking if url is pdf, jpg or png
+            if (self.root_url in next_url) and (next_url not in self.visited) \
+                    and not next_url.endswith((".pdf", ".jpg", ".png")):
+                self.visited.add(next_url)
+                self.parents[next_url] = url
+                child_pages.append(next_url)
+
+        return child_pages
+
+    # Check if the URL or the URL it redirects to is present in target URLs
+    def is_target(self, url):
+        if url in self.target_urls:
+            return True
+        redirected_url, _ = self.crawler.get_page(url)
+        return redirected_url in self.target_urls
+
+    # Follow the parent pointers back to the SHC URL
+    def get_trace(self, url):
+        trace = []
+        while url is not None:
+            trace.append(url)
+            url = self.parents[url]
+        return trace[::-1]
+
+    # Check if the crawl fetched as many pages or ran as long as allowed, pages of the link graph are free
+    def is_over_budget(self):
+        return self.crawler.no_of_fetched_pages >= self.max_pages or time.monotonic() - self.started_at >= self.max_seconds
+
+    # Search the website level by level, returning the number of clicks and the trace, or -1 and [] if no target is found
+    def run(self):
+        self.started_at = time.monotonic()
+        # Pages of a level are fetched in batches so that the budget is checked while a large level is visited
+        batch_size = 4 * self.crawler.max_connections
+
+        while self.frontier:
+            if self.verbose:
+                print("      - Searching web pages with minimum number of clicks =", self.level)
+
+            # Any page of the level matching directly is as close as any other, no need to fetch the level
+            for url in self.frontier:
+                if url in self.target_urls:
+                    return self.level, self.get_trace(url)
+
+            # Fetch the pages of the level concurrently before visiting them one by one
+            for start in range(0, len(self.frontier), batch_size):
+                if self.is_over_budget():
+                    self.budget_exceeded = True
+                    return -1, []
+
+                batch = self.frontier[start:start + batch_size]
+                self.crawler.fetch_pages(batch)
+                for url in batch:
+                    if self.is_target(url):
+                        return self.level, self.get_trace(url)
+
+            if self.level == self.level_threshold:
+                break
+
+            # The next level is made of the pages linked from this level
+            next_frontier = []
+            for url in self.frontier:
+                next_frontier.extend(self.get_child_pages(url))
+            self.frontier = next_frontier
+            self.level += 1
+
+        return -1, []
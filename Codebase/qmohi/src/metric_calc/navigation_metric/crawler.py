@@ -0,0 +1,131 @@
+"""
+Fetch the web pages of a website and extract their hyperlinks
+Input - URLs of the web pages
+Output - redirected URL and hyperlinks of every web page
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from qmohi.src.browser_pool import get_browser_pool
+from qmohi.src.data_prep.page_downloader import PageDownloader
+
+# Maximum number of pages fetched at the same time
+MAX_CONNECTIONS = 8
+# Seconds to wait for the server to connect and respond
+TIMEOUT = 30
+# Number of retries after a failed fetch
+MAX_RETRIES = 1
+
+
+# Collect the hyperlinks of an HTML page the way the browser resolves them
+class LinkExtractor(HTMLParser):
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.links = []
+        self.has_script = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "base":
+            href = dict(attrs).get("href")
+            if href:
+                self.base_url = urljoin(self.base_url, href)
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href is not None:
+                self.links.append(urljoin(self.base_url, href.strip()))
+        elif tag == "script":
+            self.has_script = True
+
+
+class Crawler:
+
+    def __init__(self, driver_path=None, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT, max_retries=MAX_RETRIES, link_graph=None):
+        # Selenium is only used for the pages rendering their hyperlinks with JavaScript, if a driver is given
+        self.driver_path = driver_path
+        self.max_connections = max_connections
+        self.downloader = PageDownloader(max_connections=max_connections, timeout=timeout, max_retries=max_retries)
+        # Pages stored in previous runs are used instead of fetching them again, if a link graph is given
+        self.link_graph = link_graph
+        # Pages fetched during the crawl, structured as such: {'url': (redirected_url, [hyperlinks])}
+        self.pages = {}
+        # Number of pages requested from the website, as opposed to the pages found in the link graph
+        self.no_of_fetched_pages = 0
+        self.lock = threading.Lock()
+        # The same threads, and so the same connections, fetch all the pages of the website
+        self.executor = ThreadPoolExecutor(max_workers=max_connections)
+
+    # Load the page in a browser of the pool to run its JavaScript
+    def fetch_page_with_browser(self, url):
+        with get_browser_pool(self.driver_path).browser() as driver:
+            driver.get(url)
+            links = [elem.get_attribute("href") for elem in driver.find_elements_by_xpath('//a[@href]')]
+            return driver.current_url, links
+
+    def fetch_page(self, url):
+        # The body is only downloaded after checking the content type
+        response = self.downloader.fetch(url, stream=True)
+        try:
+            # Only HTML pages have hyperlinks to follow
+            if "html" not in response.headers.get("Content-Type", ""):
+                return response.url, []
+
+            extractor = LinkExtractor(response.url)
+            extractor.feed(response.text)
+            extractor.close()
+        finally:
+            response.close()
+
+        # A page without hyperlinks but with scripts is likely to build them in the browser
+        if self.driver_path and not extractor.links and extractor.has_script:
+            try:
+                return self.fetch_page_with_browser(url)
+
+            except WebDriverException as e:
+                print("Web driver exception in selenium :", e.msg)
+
+        return response.url, extractor.links
+
+    # Get the redirected URL and the hyperlinks of the page, fetching it only once per crawl
+    def get_page(self, url):
+        with self.lock:
+            page = self.pages.get(url)
+        if page is not None:
+            return page
+
+        if self.link_graph:
+            page = self.link_graph.get_page(url)
+
+        if page is None:
+            with self.lock:
+                self.no_of_fetched_pages += 1
+            try:
+                page = self.fetch_page(url)
+                if self.link_graph:
+                    self.link_graph.put(url, *page)
+
+            # Pages failing to load are not stored in the link graph, so that they are fetched again next time
+            except requests.RequestException as e:
+                print("Error in fetching the web page!")
+                print(url, " : ", e)
+                page = (url, [])
+
+        with self.lock:
+            self.pages[url] = page
+        return page
+
+    # Fetch the pages concurrently ahead of their use
+    def fetch_pages(self, urls):
+        with self.lock:
+            urls = [url for url in dict.fromkeys(urls) if url not in self.pages]
+        list(self.executor.map(self.get_page, urls))
+
+    # Stop the threads and close the connections once the website is crawled
+    def close(self):
+        self.executor.shutdown()
+        self.downloader.close()
@@ -0,0 +1,87 @@
+"""
+Persistent link graph of a website crawled for the navigation metric
+Input - redirected URL and hyperlinks of the fetched web pages
+Output - pages fetched in previous runs, reused until they are older than the maximum age
+"""
+import datetime
+import hashlib
+import json
+import threading
+from os import makedirs
+from os.path import dirname, isfile, join
+
+from qmohi.src.atomic_write import atomic_write
+
+# Days after which a page of the link graph is fetched again
+LINK_GRAPH_MAX_AGE = 30
+
+
+# Path of the link graph of the website under the cache directory
+def get_link_graph_path(cache_dir, shc_url):
+    return join(cache_dir, "link_graphs", hashlib.sha256(shc_url.encode("utf-8")).hexdigest() + ".json")
+
+
+# Hash of the hyperlinks of a page, telling if the page links to the same pages as before
+def get_links_hash(links):
+    return hashlib.sha256("\n".join(sorted(set(links))).encode("utf-8")).hexdigest()
+
+
+class SiteLinkGraph:
+
+    def __init__(self, graph_path, max_age=LINK_GRAPH_MAX_AGE):
+        self.graph_path = graph_path
+        self.max_age = datetime.timedelta(days=max_age)
+        self.lock = threading.Lock()
+        # Number of pages fetched again whose hyperlinks are not the same as before
+        self.no_of_changed_pages = 0
+
+        # Nodes are structured as such: {'url': {'redirected_url': url, 'links': [url,...], 'fetched_at': time, 'links_hash': hash}}
+        self.nodes = self.load()
+        # URLs of the nodes stored by this crawl, the only ones written over the graph on disk
+        self.updated_urls = set()
+
+    def load(self):
+        if not isfile(self.graph_path):
+            return {}
+        try:
+            with open(self.graph_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print("Unable to read the link graph. Error - ", e)
+            return {}
+
+    # Get the redirected URL and the hyperlinks of the page if it was fetched within the maximum age
+    def get_page(self, url):
+        with self.lock:
+            node = self.nodes.get(url)
+        if node is None:
+            return None
+
+        fetched_at = datetime.datetime.fromisoformat(node["fetched_at"])
+        if datetime.datetime.now() - fetched_at > self.max_age:
+            return None
+        return node["redirected_url"], node["links"]
+
+    # Store the page fetched from the website
+    def put(self, url, redirected_url, links):
+        links_hash = get_links_hash(links)
+        with self.lock:
+            node = self.nodes.get(url)
+            if node and node["links_hash"] != links_hash:
+                self.no_of_changed_pages += 1
+            self.nodes[url] = {
+                "redirected_url": redirected_url,
+                "links": links,
+                "fetched_at": datetime.datetime.now().isoformat(),
+                "links_hash": links_hash
+            }
+            self.updated_urls.add(url)
+
+    # Write the link graph to disk, merged with the pages stored meanwhile by the crawls of other universities on the same website
+    def save(self):
+        makedirs(dirname(self.graph_path), exist_ok=True)
+        with self.lock:
+            nodes = self.load()
+            nodes.update({url: self.nodes[url] for url in self.updated_urls})
+            with atomic_write(self.graph_path) as f:
+                json.dump(nodes, f)
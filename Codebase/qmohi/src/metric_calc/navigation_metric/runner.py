@@ -0,0 +1,87 @@
+"""
+Calculate the navigation metric of the universities in parallel
+Input - matched web pages and SHC URL of every university
+Output - minimum number of clicks and trace of every university, in the input order
+"""
+import multiprocessing.util
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import qmohi.src.metric_calc.navigation_metric.constants as constants
+from qmohi.src.browser_pool import close_browser_pools, reset_browser_pools
+from qmohi.src.metric_calc.navigation_metric.counter import clean_target_urls
+from qmohi.src.metric_calc.navigation_metric.crawler import Crawler
+from qmohi.src.metric_calc.navigation_metric.crawl_state import CrawlState
+from qmohi.src.metric_calc.navigation_metric.link_graph import SiteLinkGraph, get_link_graph_path
+from qmohi.src.metric_calc.navigation_metric.target_urls import TargetURLSet
+
+
+# Start the worker with browser pools of its own, and quit them when it exits, as worker processes skip the atexit handlers
+def init_navigation_worker():
+    # Forked workers inherit the Chrome sessions of the parent, which must not be shared nor quit by the workers
+    reset_browser_pools()
+    multiprocessing.util.Finalize(None, close_browser_pools, exitpriority=0)
+
+
+# Crawl the SHC website of a university within the budget of the site, in a worker process
+def crawl_university(no_of_links, links, shc_url, driver_path, max_pages, max_seconds, cache_dir=None):
+    started_at = time.monotonic()
+
+    # If no matching URL found!
+    if no_of_links == 0:
+        return -1, [], 0, 0, 0, False
+
+    # Pages crawled in previous runs are only fetched again once they are stale
+    link_graph = SiteLinkGraph(get_link_graph_path(cache_dir, shc_url)) if cache_dir else None
+
+    # Every crawl owns its crawler, the browsers of the worker are only used for JavaScript pages
+    crawler = Crawler(driver_path, link_graph=link_graph)
+    try:
+        target_urls = TargetURLSet(clean_target_urls(links), crawler)
+        crawl_state = CrawlState(shc_url, target_urls, crawler, max_pages=max_pages, max_seconds=max_seconds, verbose=False)
+        min_clicks, trace = crawl_state.run()
+    finally:
+        crawler.close()
+        if link_graph:
+            link_graph.save()
+
+    no_of_changed_pages = link_graph.no_of_changed_pages if link_graph else 0
+    return min_clicks, trace, crawler.no_of_fetched_pages, no_of_changed_pages, time.monotonic() - started_at, crawl_state.budget_exceeded
+
+
+# Calculate the navigation metric of the universities given as (name, no_of_links, links, shc_url), None to skip one,
+# yielding (min_clicks, trace, details) in the input order
+def get_navigation_of_universities(universities, driver_path, cache_dir=None, n_processes=constants.n_processes,
+                                   max_pages=constants.MAX_PAGES_PER_SITE, max_seconds=constants.MAX_SECONDS_PER_SITE):
+    with ProcessPoolExecutor(max_workers=n_processes, initializer=init_navigation_worker) as executor:
+        pending_universities = deque()
+
+        for university in universities:
+            future = None
+            if university is not None:
+                uni_name, no_of_links, links, shc_url = university
+                future = executor.submit(crawl_university, no_of_links, links, shc_url, driver_path, max_pages, max_seconds, cache_dir)
+            pending_universities.append(future)
+
+            # Keep a bounded number of universities in flight so that finished results do not pile up
+            if len(pending_universities) > 2 * n_processes:
+                yield collect_navigation(pending_universities.popleft())
+
+        while pending_universities:
+            yield collect_navigation(pending_universities.popleft())
+
+
+# Return the minimum number of clicks and the trace of the university, along with a summary of the crawl for the progress output
+def collect_navigation(future):
+    if future is None:
+        return None
+
+    try:
+        min_clicks, trace, no_of_pages, no_of_changed_pages, seconds, budget_exceeded = future.result()
+    except Exception as e:
+        return -1, [], f"error in calculating navigation - {e}"
+
+    details = (f"{min_clicks} clicks, {no_of_pages} pages fetched ({no_of_changed_pages} changed since the previous crawl) "
+               f"in {seconds:.1f} seconds" + (", site budget exceeded" if budget_exceeded else ""))
+    return min_clicks, trace, details
@@ -0,0 +1,46 @@
+"""
+Set of the target URLs searched by the navigation metric
+Input - URLs of the web pages matching the keywords
+Output - normalized forms of the URLs and of their redirected URLs for constant time lookups
+"""
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+# Normalize the URL so that the forms of the same page compare equal
+def normalize_url(url):
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    # http and https point to the same page, so the scheme is left out
+    netloc = (parts.hostname or "").lower()
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        netloc += ":" + str(port)
+
+    # Fragments do not change the page, and neither does a trailing slash
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", netloc, path, parts.query, ""))
+
+
+class TargetURLSet:
+
+    def __init__(self, target_urls, crawler=None):
+        self.target_urls = list(target_urls)
+        self.normalized_urls = {normalize_url(url) for url in self.target_urls}
+
+        # Add the URLs the targets redirect to, fetching every target only once
+        if crawler:
+            crawler.fetch_pages(self.target_urls)
+            for url in self.target_urls:
+                redirected_url, _ = crawler.get_page(url)
+                self.normalized_urls.add(normalize_url(redirected_url))
+
+    def __contains__(self, url):
+        return normalize_url(url) in self.normalized_urls
+
+    def __len__(self):
+        return len(self.target_urls)
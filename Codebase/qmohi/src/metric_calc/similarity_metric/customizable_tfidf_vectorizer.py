@@ -8,11 +8,16 @@ from gensim.parsing.preprocessing import strip_multiple_whitespaces, strip_non_a
 from gensim.utils import tokenize
 
 class CustomizableTfidfVectorizer:
-    def __init__(self, tf_docs=None, idf_docs=[], idf_dir=""):
+    def __init__(self, tf_docs=None, idf_docs=[], idf_dir="", idf_model=None):
+        # Token dictionaries of the TF documents, reused while the documents stay in the TF corpus
+        self.tf_dcts = {}
+        # If a precomputed IDF model is provided, use it as is.
         # If the directory path is provided, calculate IDF
         # using the documents in the directory. Otherwise,
         # a list of token lists must be passed.
-        if idf_dir:
+        if idf_model is not None:
+            self.idf_dct = idf_model
+        elif idf_dir:
             self.idf_dct = self.__get_token_dict_in_dir(idf_dir)
         else:
             self.idf_dct = self.__get_token_dict(idf_docs)
@@ -27,6 +32,8 @@ class CustomizableTfidfVectorizer:
     
     def update(self, tf_docs):
         self.tf_docs = tf_docs
+        # Only tokenize the documents that were not in the previous TF corpus
+        self.tf_dcts = {doc: self.tf_dcts[doc] if doc in self.tf_dcts else self.__get_token_dict([doc]) for doc in tf_docs}
         if tf_docs:
             self.tfidf = self.__compute_tfidf()
             self.vocab = list(set(key[1] for key in self.tfidf.keys()))
@@ -76,7 +83,7 @@ class CustomizableTfidfVectorizer:
     def __compute_tfidf(self):
         tfidf = {}
         for doc_idx, doc in enumerate(self.tf_docs):
-            tf_dct = self.__get_token_dict([doc])
+            tf_dct = self.tf_dcts[doc]
             for word in tf_dct.itervalues():
                 if self.idf_dct.token2id.get(word):
                     tf = tf_dct.cfs[tf_dct.token2id.get(word)] / len(doc)
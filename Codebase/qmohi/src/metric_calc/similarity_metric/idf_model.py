@@ -0,0 +1,121 @@
+"""
+IDF statistics of the MedlinePlus health topics corpus, built once and stored under the cache directory
+Input - health topics corpus, one document per line
+Output - vocabulary and document frequencies, looked up the same way as a gensim Dictionary
+Usage - python -m qmohi.src.metric_calc.similarity_metric.idf_model CACHE_DIR [--corpus CORPUS_PATH]
+"""
+import argparse
+import hashlib
+from os import makedirs
+from os.path import dirname, join
+import numpy as np
+
+from qmohi.src.atomic_write import atomic_write
+
+HEALTH_TOPICS_CORPUS_PATH = "./qmohi/src/metric_calc/similarity_metric/medlineplus_health_topics_corpus.txt"
+IDF_MODEL_FILE_NAME = "medlineplus_health_topics_idf.npz"
+
+# Version of the stored arrays, models of another version are built again
+IDF_MODEL_VERSION = 1
+
+# Models loaded in this process, structured as such: {(corpus_path, model_path): IDFModel}
+idf_models = {}
+
+
+# Path of the model under the cache directory
+def get_idf_model_path(cache_dir):
+    return join(cache_dir, "idf", IDF_MODEL_FILE_NAME)
+
+
+# Hash of the corpus, telling if the model was built from the current corpus
+def get_corpus_hash(corpus_path):
+    with open(corpus_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class IDFModel:
+
+    def __init__(self, vocab, dfs, num_docs, corpus_hash):
+        # The vocabulary is kept in the ID order of the Dictionary it was built from, so IDs are the same
+        self.token2id = {word: i for i, word in enumerate(vocab)}
+        self.dfs = dfs
+        self.num_docs = num_docs
+        self.corpus_hash = corpus_hash
+
+    def __len__(self):
+        return len(self.token2id)
+
+    # Write the model to disk, replacing the file at once so that concurrent runs never read a partial model
+    def save(self, model_path):
+        makedirs(dirname(model_path), exist_ok=True)
+        with atomic_write(model_path, "wb") as f:
+            np.savez(f, version=np.array(IDF_MODEL_VERSION), vocab=np.array(list(self.token2id), dtype=str),
+                     dfs=self.dfs, num_docs=np.array(self.num_docs), corpus_hash=np.array(self.corpus_hash))
+
+
+# Read the model written by IDFModel.save
+def load_idf_model(model_path):
+    with np.load(model_path, allow_pickle=False) as data:
+        if int(data["version"]) != IDF_MODEL_VERSION:
+            raise ValueError(f"version {int(data['version'])} instead of {IDF_MODEL_VERSION}")
+        return IDFModel(data["vocab"].tolist(), data["dfs"], int(data["num_docs"]), str(data["corpus_hash"]))
+
+
+# Build the model from the corpus with the tokenization of the TF-IDF vectorizer
+def build_idf_model(corpus_path=HEALTH_TOPICS_CORPUS_PATH):
+    from qmohi.src.metric_calc.similarity_metric.customizable_tfidf_vectorizer import CustomizableTfidfVectorizer
+
+    with open(corpus_path, "r") as f:
+        idf_corpus = f.readlines()
+
+    idf_dct = CustomizableTfidfVectorizer(idf_docs=idf_corpus).idf_dct
+    vocab = [idf_dct[i] for i in range(len(idf_dct))]
+    dfs = np.array([idf_dct.dfs.get(i, 0) for i in range(len(idf_dct))], dtype=np.int64)
+    return IDFModel(vocab, dfs, idf_dct.num_docs, get_corpus_hash(corpus_path))
+
+
+# Build the model and store it if a path is given, returning the model
+def rebuild_idf_model(corpus_path=HEALTH_TOPICS_CORPUS_PATH, model_path=None):
+    print("Building the IDF model of", corpus_path, "...")
+    idf_model = build_idf_model(corpus_path)
+    if model_path:
+        try:
+            idf_model.save(model_path)
+            print("Stored the IDF model of", idf_model.num_docs, "documents and", len(idf_model), "words in", model_path)
+        except OSError as e:
+            print("Unable to store the IDF model. Error - ", e)
+    idf_models[corpus_path, model_path] = idf_model
+    return idf_model
+
+
+# Load the model once per process, building it again if it is missing or the corpus has changed,
+# only kept in memory if no model path is given
+def get_idf_model(corpus_path=HEALTH_TOPICS_CORPUS_PATH, model_path=None):
+    idf_model = idf_models.get((corpus_path, model_path))
+    if idf_model is not None:
+        return idf_model
+    if not model_path:
+        return rebuild_idf_model(corpus_path)
+
+    try:
+        idf_model = load_idf_model(model_path)
+    except FileNotFoundError:
+        return rebuild_idf_model(corpus_path, model_path)
+    except (OSError, ValueError, KeyError) as e:
+        print("Unable to read the IDF model. Error - ", e)
+        return rebuild_idf_model(corpus_path, model_path)
+
+    if idf_model.corpus_hash != get_corpus_hash(corpus_path):
+        print("The IDF model was built from another version of the corpus")
+        return rebuild_idf_model(corpus_path, model_path)
+
+    idf_models[corpus_path, model_path] = idf_model
+    return idf_model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the IDF model of the health topics corpus used by the similarity metric")
+    parser.add_argument("cache_dir", help="Cache directory of the runs, the 'Cache' folder next to the run output folders")
+    parser.add_argument("--corpus", default=HEALTH_TOPICS_CORPUS_PATH, help="Health topics corpus, one document per line")
+    args = parser.parse_args()
+    rebuild_idf_model(args.corpus, get_idf_model_path(args.cache_dir))
@@ -1,37 +1,48 @@
 import re
+from collections import Counter
 import numpy as np
-from os import listdir
-from os.path import isfile, join
+from os import makedirs
+from os.path import dirname
 from sklearn.metrics.pairwise import cosine_similarity
 from gensim.parsing.preprocessing import strip_multiple_whitespaces, strip_non_alphanum, strip_numeric, strip_punctuation
 from gensim.utils import tokenize
 
 from qmohi.src.metric_calc.similarity_metric.customizable_tfidf_vectorizer import CustomizableTfidfVectorizer
-
-STOPWORD_FILE_PATH = "./qmohi/src/metric_calc/similarity_metric/stopwords"
-HEALTH_TOPICS_CORPUS_PATH = "./qmohi/src/metric_calc/similarity_metric/medlineplus_health_topics_corpus.txt"
+from qmohi.src.metric_calc.similarity_metric.idf_model import get_idf_model, get_idf_model_path
+from qmohi.src.metric_calc.similarity_metric.stopword_registry import get_stopwords
 
 class Similarity:
-    def __init__(self, word_vector):
+    def __init__(self, word_vector, cache_dir=None):
         self.word_vector = word_vector
-
-    def remove_stopwords(self, doc):
-        stopword_file_paths = [join(STOPWORD_FILE_PATH, f) for f in listdir(STOPWORD_FILE_PATH) if isfile(join(STOPWORD_FILE_PATH, f)) and f.startswith("stopwords")]
-        doc = list(tokenize(doc, to_lower=True, deacc = True))
-        # Read stopword files
-        for stopword_file_path in stopword_file_paths:
-            with open(stopword_file_path, 'r') as f:
-                stopwords = f.read()
-                doc = [word for word in doc if word not in stopwords]
-        return " ".join(doc)
-
-    # Preprocess the document
-    def preprocess_document(self, doc):
-        # Remove URLs
+        # The IDF model is stored under the cache directory if one is given, otherwise it is built for the run only
+        self.cache_dir = cache_dir
+        # Comparison document without the words of the stopword files, structured as such: (document, [tokens])
+        self.comparison_tokens = None
+        # TF-IDF vectorizer using the precomputed IDF model of the health topics corpus, created on first use
+        self.tfidf_vectorizer = None
+
+    def remove_stopwords(self, doc, extra_stopwords=None):
+        # Stopwords found by TF-IDF are passed by the caller, as they depend on the documents being compared
+        return " ".join(self.remove_extra_stopwords(self.remove_file_stopwords(doc), extra_stopwords))
+
+    # Tokenize the document and remove the words of the stopword files
+    def remove_file_stopwords(self, doc):
+        stopwords = get_stopwords()
+        return [word for word in tokenize(doc, to_lower=True, deacc = True) if word not in stopwords]
+
+    # Remove the given stopwords the same way as the ones of the stopword files
+    def remove_extra_stopwords(self, tokens, extra_stopwords):
+        if not extra_stopwords:
+            return tokens
+        stopwords = frozenset(extra_stopwords)
+        return [word for word in tokens if word not in stopwords]
+
+    def remove_urls(self, doc):
         doc = re.sub(r"http\S+", "", doc, flags=re.MULTILINE)
         doc = re.sub(r"www\S+", "", doc, flags=re.MULTILINE)
-        # Remove stop words
-        doc = self.remove_stopwords(doc)
+        return doc
+
+    def clean_document(self, doc):
         # Remove punctuation
         doc = strip_punctuation(doc)
         # Remove non-alphanumeric characters
@@ -42,32 +53,40 @@ class Similarity:
         doc = strip_multiple_whitespaces(doc)
         return doc
 
+    # Preprocess the document
+    def preprocess_document(self, doc, extra_stopwords=None):
+        # Remove URLs
+        doc = self.remove_urls(doc)
+        # Remove stop words
+        doc = self.remove_stopwords(doc, extra_stopwords)
+        return self.clean_document(doc)
+
     # Tokenize the document
-    def get_token_list(self, doc, _print=False):
+    def get_token_list(self, doc, _print=False, extra_stopwords=None):
         # Data cleaning
-        doc = self.preprocess_document(doc)
+        doc = self.preprocess_document(doc, extra_stopwords)
         if _print:
             print(doc)
         # Return token list
         return list(tokenize(doc, to_lower=True, deacc = True))
 
     def calculate_tfidf(self, comparison_document, shc_content):
-        # Precompute IDF corpus
-        with open(HEALTH_TOPICS_CORPUS_PATH, "r") as f:
-            idf_corpus = f.readlines()
+        if self.tfidf_vectorizer is None:
+            model_path = get_idf_model_path(self.cache_dir) if self.cache_dir else None
+            self.tfidf_vectorizer = CustomizableTfidfVectorizer(idf_model=get_idf_model(model_path=model_path))
 
-        # Build TF corpus
+        # Build TF corpus, the comparison document is only tokenized for the first university
         tf_corpus = [comparison_document, shc_content]
+        self.tfidf_vectorizer.update(tf_corpus)
 
-        ctfidf = CustomizableTfidfVectorizer(tf_corpus, idf_corpus)
-
-        features = ctfidf.filter_tfidf(max=0.001, print_=False)
+        # Words of low TF-IDF in both documents, only kept in memory so that similarities can be calculated in parallel
+        return self.tfidf_vectorizer.filter_tfidf(max=0.001, print_=False)
 
-        # Export into file
-        with open(join(STOPWORD_FILE_PATH, 'stopwords_tfidf.txt'), 'w') as f:
-            f.write("\n".join(features))
-
-        return features
+    # Export the stopwords found by TF-IDF as an artifact of the run
+    def export_tfidf_stopwords(self, features, file_path):
+        makedirs(dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            f.write("\n".join(sorted(features)))
 
     def get_label(self, similarity):
         if similarity >= 0.8:
@@ -76,23 +95,42 @@ class Similarity:
             return "Moderate"
         return "Low"
 
+    # Sum the word vectors of the tokens, optionally weighted by the IDF of the tokens
+    def embed_tokens(self, tokens, idf_weights=None):
+        # Map every distinct token to its row in the word vectors once, and count its occurrences
+        counts = Counter(token for token in tokens if token in self.word_vector)
+        if not counts:
+            return np.zeros(self.word_vector.vector_size)
+
+        words = list(counts)
+        weights = np.array([counts[word] for word in words], dtype=np.float64)
+        if idf_weights:
+            weights *= np.array([idf_weights.get(word, 1.0) for word in words])
+        indices = np.array([self.word_vector.key_to_index[word] for word in words])
+
+        # Gather the rows and sum them in a single operation
+        return weights @ np.asarray(self.word_vector.vectors[indices], dtype=np.float64)
+
+    # Embed the comparison document, removing the words of the stopword files only once for all the universities
+    def embed_comparison_document(self, comparison_document, extra_stopwords=None, idf_weights=None):
+        if self.comparison_tokens is None or self.comparison_tokens[0] != comparison_document:
+            self.comparison_tokens = (comparison_document, self.remove_file_stopwords(self.remove_urls(comparison_document)))
+
+        doc = " ".join(self.remove_extra_stopwords(self.comparison_tokens[1], extra_stopwords))
+        tokens = list(tokenize(self.clean_document(doc), to_lower=True, deacc = True))
+        return self.embed_tokens(tokens, idf_weights)
+
     # Calculate the similarity based on the given word vector
-    def calculate_similarity(self, comparison_document, shc_content):
+    def calculate_similarity(self, comparison_document, shc_content, idf_weights=None, tfidf_stopword_file_path=None):
         # Calculate TF-IDF
-        self.calculate_tfidf(comparison_document, shc_content)
-
-        # sum1 will hold the sum of all of its word's vectors
-        sum1 = [0] * len(self.word_vector['word'])
-        for token in self.get_token_list(comparison_document):
-            if token in self.word_vector:
-                sum1 = np.sum([sum1, self.word_vector[token]], axis=0)
+        features = self.calculate_tfidf(comparison_document, shc_content)
+        if tfidf_stopword_file_path:
+            self.export_tfidf_stopwords(features, tfidf_stopword_file_path)
 
-        # sum2 will hold the sum of all of its word's vectors
-        sum2 = [0] * len(self.word_vector['word'])
-        for token in self.get_token_list(shc_content):
-            if token in self.word_vector:
-                sum2 = np.sum([sum2, self.word_vector[token]], axis=0)
+        # Sum of the word vectors of each document, without the words of low TF-IDF in both documents
+        comparison_vector = self.embed_comparison_document(comparison_document, features, idf_weights)
+        shc_vector = self.embed_tokens(self.get_token_list(shc_content, extra_stopwords=features), idf_weights)
 
         # Calculate the cosine similarity
-        similarity = cosine_similarity([sum1], [sum2])[0][0]
+        similarity = cosine_similarity([comparison_vector], [shc_vector])[0][0]
         return similarity, self.get_label(similarity)
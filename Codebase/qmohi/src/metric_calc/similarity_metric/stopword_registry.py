@@ -0,0 +1,76 @@
+"""
+Stopwords of the stopword files, read once and shared by the text cleaning functions
+Input - directory of stopword files, one word per line
+Output - frozen set of the stopwords of a named profile
+"""
+import os
+import threading
+from os import listdir
+from os.path import isfile, join
+
+STOPWORD_FILE_PATH = "./qmohi/src/metric_calc/similarity_metric/stopwords"
+
+TFIDF_STOPWORD_FILE_NAME = "stopwords_tfidf.txt"
+
+# Stopword files of every profile, selected by their file name
+STOPWORD_PROFILES = {
+    # Stopword files of the similarity metric, without the stopwords found by TF-IDF
+    "default": lambda file_name: file_name.startswith("stopwords") and file_name != TFIDF_STOPWORD_FILE_NAME,
+    # Stopword files including the stopwords found by TF-IDF, for the scripts exporting them into a file
+    "tfidf": lambda file_name: file_name.startswith("stopwords"),
+    # General English stopwords only
+    "base": lambda file_name: file_name == "stopwords.txt",
+}
+
+
+class StopwordRegistry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Words of every file read, structured as such: {'path': ((modified_time, size), frozenset)}
+        self.files = {}
+        # Words of every profile, structured as such: {('directory', 'profile'): ([frozenset,...], frozenset)}
+        self.profiles = {}
+
+    # Read the words of the file, only reading it again once it has changed
+    def get_file_stopwords(self, path):
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.files.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(path, "r") as f:
+            stopwords = frozenset(word for word in (line.strip().lower() for line in f) if word)
+        with self.lock:
+            self.files[path] = (signature, stopwords)
+        return stopwords
+
+    # Get the stopwords of all the files of the profile in the directory
+    def get(self, profile="default", stopword_dir=STOPWORD_FILE_PATH):
+        if profile not in STOPWORD_PROFILES:
+            raise ValueError(f"Unknown stopword profile '{profile}', expected one of {list(STOPWORD_PROFILES)}")
+
+        stopword_file_paths = sorted(join(stopword_dir, f) for f in listdir(stopword_dir)
+                                     if isfile(join(stopword_dir, f)) and STOPWORD_PROFILES[profile](f))
+        file_stopwords = [self.get_file_stopwords(path) for path in stopword_file_paths]
+
+        # The union is only built again if one of the files has changed
+        with self.lock:
+            cached = self.profiles.get((stopword_dir, profile))
+        if cached is not None and len(cached[0]) == len(file_stopwords) and all(a is b for a, b in zip(cached[0], file_stopwords)):
+            return cached[1]
+
+        stopwords = frozenset().union(*file_stopwords)
+        with self.lock:
+            self.profiles[stopword_dir, profile] = (file_stopwords, stopwords)
+        return stopwords
+
+
+stopword_registry = StopwordRegistry()
+
+
+# Get the stopwords of the profile from the registry shared by the process
+def get_stopwords(profile="default", stopword_dir=STOPWORD_FILE_PATH):
+    return stopword_registry.get(profile, stopword_dir)
@@ -0,0 +1,85 @@
+"""
+Word vectors stored in a native format that is memory-mapped instead of parsed
+Input - word2vec binary model, converted once into the store directory
+Output - word vectors looked up the same way as gensim KeyedVectors
+Usage - python -m qmohi.src.metric_calc.similarity_metric.word_vector_store MODEL_PATH STORE_DIR [--normalize]
+"""
+import argparse
+import json
+from os import makedirs
+from os.path import isfile, join
+import numpy as np
+
+VECTORS_FILE_NAME = "vectors.npy"
+VOCAB_FILE_NAME = "vocab.txt"
+META_FILE_NAME = "meta.json"
+
+
+# Check if the path is a directory written by convert_word2vec
+def is_word_vector_store(path):
+    return isfile(join(path, META_FILE_NAME))
+
+
+# Convert the word2vec binary model into a float32 array and a vocabulary in the index order of the array
+def convert_word2vec(model_path, store_dir, normalize=False):
+    from gensim.models import KeyedVectors
+
+    print("Loading model...")
+    wv = KeyedVectors.load_word2vec_format(model_path, binary=True)
+    vectors = np.asarray(wv.vectors, dtype=np.float32)
+
+    # Unit length vectors make every word count the same in a document vector instead of by its magnitude
+    if normalize:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors = vectors / norms
+
+    # Words are stored one per line, so a word spanning lines would shift the index of the next words
+    if any("\n" in word for word in wv.index_to_key):
+        raise ValueError("The model has words containing a line break, which cannot be stored in the vocabulary file")
+
+    makedirs(store_dir, exist_ok=True)
+    np.save(join(store_dir, VECTORS_FILE_NAME), vectors)
+    # Line endings are written and read as is, so that a carriage return stays part of its word
+    with open(join(store_dir, VOCAB_FILE_NAME), "w", encoding="utf-8", newline="") as f:
+        f.write("\n".join(wv.index_to_key))
+    with open(join(store_dir, META_FILE_NAME), "w") as f:
+        json.dump({"source": model_path, "count": vectors.shape[0], "dimension": vectors.shape[1],
+                   "normalized": normalize}, f)
+    print("Stored", vectors.shape[0], "word vectors in", store_dir)
+
+
+class WordVectorStore:
+    def __init__(self, store_dir):
+        with open(join(store_dir, META_FILE_NAME), "r") as f:
+            self.meta = json.load(f)
+
+        # The array is mapped read-only, so the processes using the store share the same physical pages
+        self.vectors = np.load(join(store_dir, VECTORS_FILE_NAME), mmap_mode="r")
+        # The vocabulary is a dictionary private to every process, as it is looked up for every token
+        with open(join(store_dir, VOCAB_FILE_NAME), "r", encoding="utf-8", newline="") as f:
+            words = f.read().split("\n")
+        if not len(words) == self.vectors.shape[0] == self.meta["count"]:
+            raise ValueError(f"The word vector store in {store_dir} has {len(words)} words for {self.vectors.shape[0]} vectors "
+                             f"instead of {self.meta['count']}, convert the model again")
+        self.key_to_index = {word: i for i, word in enumerate(words)}
+        self.vector_size = self.vectors.shape[1]
+
+    def __contains__(self, word):
+        return word in self.key_to_index
+
+    def __getitem__(self, word):
+        return self.vectors[self.key_to_index[word]]
+
+    def __len__(self):
+        return len(self.key_to_index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a word2vec binary model into a memory-mapped word vector store")
+    parser.add_argument("model_path", help="word2vec binary model, e.g. GoogleNews-vectors-negative300.bin")
+    parser.add_argument("store_dir", help="Directory to write the word vector store to")
+    parser.add_argument("--normalize", action="store_true",
+                        help="Store unit length vectors, which changes the similarity scores compared with the original model")
+    args = parser.parse_args()
+    convert_word2vec(args.model_path, args.store_dir, args.normalize)
@@ -3,7 +3,7 @@ import numpy as np
 import pandas as pd
 import sys
 from os import listdir, makedirs
-from os.path import isdir, isfile, join, dirname
+from os.path import abspath, isdir, isfile, join, dirname
 import csv
 from bs4 import BeautifulSoup
 from sklearn.metrics.pairwise import cosine_similarity
@@ -13,6 +13,9 @@ from gensim.utils import tokenize
 
 from customizable_tfidf_vectorizer import CustomizableTfidfVectorizer
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.metric_calc.similarity_metric.stopword_registry import get_stopwords
+
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -85,16 +88,8 @@ def get_text_from_html_file(file_path):
     return soup.get_text(separator=" ", strip=True)
 
 def remove_optional_stopwords(doc):
-    stopword_file_paths = [join(STOPWORD_FILE_PATH, f) for f in listdir(STOPWORD_FILE_PATH) if isfile(join(STOPWORD_FILE_PATH, f)) and f.startswith("stopwords")]
-
-    doc = list(tokenize(doc, to_lower=True, deacc = True))
-    # print(f'before: {len(doc)}')
-    # Read stopword files
-    for stopword_file_path in stopword_file_paths:
-        with open(stopword_file_path, 'r') as f:
-            stopwords = f.read()
-            doc = [word for word in doc if word not in stopwords]
-    # print(f'after: {len(doc)}')
+    stopwords = get_stopwords("tfidf", STOPWORD_FILE_PATH)
+    doc = [word for word in tokenize(doc, to_lower=True, deacc = True) if word not in stopwords]
     return " ".join(doc)
 
 # Preprocess the document
@@ -1,7 +1,7 @@
 import re
 import sys
 from os import listdir, makedirs
-from os.path import isdir, isfile, join, dirname
+from os.path import abspath, isdir, isfile, join, dirname
 from bs4 import BeautifulSoup
 from gensim.parsing.preprocessing import strip_multiple_whitespaces, strip_non_alphanum, strip_numeric, strip_punctuation
 from gensim.utils import tokenize
@@ -10,6 +10,9 @@ import pandas as pd
 
 from customizable_tfidf_vectorizer import CustomizableTfidfVectorizer
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.metric_calc.similarity_metric.stopword_registry import get_stopwords
+
 INPUT_PATH = "./output"
 STOPWORD_FILE_PATH = "./stopwords"
 HEALTH_TOPICS_PATH = "./health_topics_summary"
@@ -34,15 +37,8 @@ def get_text_from_html_file(file_path):
     return soup.get_text(separator=" ", strip=True)
 
 def remove_stopwords(doc):
-    stopword_file_paths = [join(STOPWORD_FILE_PATH, f) for f in listdir(STOPWORD_FILE_PATH) if isfile(join(STOPWORD_FILE_PATH, f)) and f.startswith("stopwords")]
-
-    doc = list(tokenize(doc, to_lower=True, deacc = True))
-
-    # Read stopword files
-    for stopword_file_path in stopword_file_paths:
-        with open(stopword_file_path, 'r') as f:
-            stopwords = f.read()
-            doc = [word for word in doc if word not in stopwords]
+    stopwords = get_stopwords("tfidf", STOPWORD_FILE_PATH)
+    doc = [word for word in tokenize(doc, to_lower=True, deacc = True) if word not in stopwords]
     return " ".join(doc)
 
 # Preprocess the document
@@ -1,7 +1,8 @@
 import re
+import sys
 import numpy as np
-from os import listdir, makedirs
-from os.path import isdir, isfile, join, dirname, exists
+from os import makedirs
+from os.path import abspath, isdir, join, dirname, exists
 import csv
 from bs4 import BeautifulSoup
 from sklearn.metrics.pairwise import cosine_similarity
@@ -9,6 +10,9 @@ from gensim.models import KeyedVectors
 from gensim.parsing.preprocessing import remove_stopwords, strip_multiple_whitespaces, strip_non_alphanum, strip_numeric, strip_punctuation
 from gensim.utils import tokenize
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.metric_calc.similarity_metric.stopword_registry import get_stopwords
+
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -23,16 +27,8 @@ def get_text_from_file(file_path):
     return text
 
 def remove_optional_stopwords(doc):
-    stopword_file_paths = [join(STOPWORD_FILE_PATH, f) for f in listdir(STOPWORD_FILE_PATH) if isfile(join(STOPWORD_FILE_PATH, f)) and f.startswith("stopwords")]
-
-    doc = list(tokenize(doc, to_lower=True, deacc = True))
-    # print(f'before: {len(doc)}')
-    # Read stopword files
-    for stopword_file_path in stopword_file_paths:
-        with open(stopword_file_path, 'r') as f:
-            stopwords = f.read()
-            doc = [word for word in doc if word not in stopwords]
-    # print(f'after: {len(doc)}')
+    stopwords = get_stopwords("tfidf", STOPWORD_FILE_PATH)
+    doc = [word for word in tokenize(doc, to_lower=True, deacc = True) if word not in stopwords]
     return " ".join(doc)
 
 # Preprocess the document
@@ -1,11 +1,14 @@
 import sys
 import re
-from os.path import join
+from os.path import abspath, dirname, join
 from nltk.stem import WordNetLemmatizer
 from gensim.parsing.preprocessing import remove_stopwords, strip_multiple_whitespaces, strip_non_alphanum, strip_numeric, strip_punctuation
 from gensim.utils import tokenize
 from textblob import TextBlob
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.metric_calc.similarity_metric.stopword_registry import get_stopwords
+
 STOPWORD_FILE_PATH = "./../Ideal Document Generation/stopwords"
 
 EXPERIMENTAL_TERMS = [
@@ -56,13 +59,8 @@ def get_lines_of_text_from_file(file_path):
     return docs
 
 def remove_optional_stopwords(doc):
-    doc = list(tokenize(doc, to_lower=True, deacc = True))
-
-    # Read stopword files
-    with open(join(STOPWORD_FILE_PATH, "stopwords.txt"), 'r') as f:
-        stopwords = f.read()
-        doc = [word for word in doc if word not in stopwords]
-
+    stopwords = get_stopwords("base", STOPWORD_FILE_PATH)
+    doc = [word for word in tokenize(doc, to_lower=True, deacc = True) if word not in stopwords]
     return " ".join(doc)
 
 def minimal_preprocess_document(doc):
@@ -1,7 +1,8 @@
 import io
 import re
+import sys
 from os import listdir
-from os.path import isdir, isfile, join
+from os.path import isdir, isfile, join, dirname, abspath
 
 import requests
 from tempfile import TemporaryDirectory
@@ -13,15 +14,33 @@ from PIL import Image
 from bs4 import BeautifulSoup
 import docx2txt
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.data_prep.ocr_cache import OCRCache
+
 PDF_URL = "https://aclanthology.org/2020.bea-1.1.pdf"
 IMAGES_URL1 = "https://medlineplus.gov/bonesjointsandmuscles.html"
 IMAGES_URL2 = "https://blog.hubspot.com/sales/famous-quotes"
 DOCX_PATH = "./NKU Facilities and Resources 2020.docx"
 OUTPUT_DIR = "./"
+OCR_CACHE_DIR = "./ocr_cache"
+
+ocr_cache = None
 
 def get_text_in_image(input_image):
-    image = Image.open(input_image)
-    text = str(pytesseract.image_to_string(image))
+    global ocr_cache
+    # Read the image bytes to look up the text recognized in the same image before
+    if isinstance(input_image, io.BytesIO):
+        image_bytes = input_image.getvalue()
+    else:
+        with open(input_image, "rb") as f:
+            image_bytes = f.read()
+    if ocr_cache is None:
+        ocr_cache = OCRCache(OCR_CACHE_DIR, namespace="tesseract")
+    text = ocr_cache.get(image_bytes)
+    if text is None:
+        image = Image.open(io.BytesIO(image_bytes))
+        text = str(pytesseract.image_to_string(image))
+        ocr_cache.put(image_bytes, text)
     return text
 
 def fetch_image_to_text(url, output_path):
@@ -68,7 +87,7 @@ def pdf_to_text(url, output_path):
         # Recognizing text from the images using OCR
         with open(output_path, "a") as f:
             for image_file in image_file_list:
-                text = str(pytesseract.image_to_string(Image.open(image_file)))
+                text = get_text_in_image(image_file)
                 text = text.replace("-\n", "")
                 f.write(text)
 
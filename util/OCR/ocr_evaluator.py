@@ -1,5 +1,5 @@
 import sys
-from os.path import join, dirname
+from os.path import join, dirname, abspath
 from tempfile import TemporaryDirectory
 import pandas as pd
 from gensim.parsing.preprocessing import strip_multiple_whitespaces, strip_non_alphanum
@@ -12,8 +12,28 @@ import cv2
 # import keras_ocr
 import easyocr
 
+sys.path.append(join(dirname(abspath(__file__)), "../../Codebase"))
+from qmohi.src.data_prep.ocr_cache import OCRCache
+
 OUTPUT_DIR = "./"
 TEST_DATA_DIR = "./test_images"
+OCR_CACHE_DIR = "./ocr_cache"
+
+easy_ocr_reader = None
+ocr_caches = {}
+
+# Look up the text recognized in the same image by the given OCR engine before running it
+def get_cached_text(image_path, engine_name, recognize):
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+    if engine_name not in ocr_caches:
+        ocr_caches[engine_name] = OCRCache(OCR_CACHE_DIR, namespace=engine_name)
+    cache = ocr_caches[engine_name]
+    text = cache.get(image_bytes)
+    if text is None:
+        text = recognize(image_path)
+        cache.put(image_bytes, text)
+    return text
 
 def get_text_in_image_by_tesseract(image_path):
     img = cv2.imread(image_path)
@@ -36,8 +56,11 @@ def get_text_in_image_by_keras_ocr(image_path):
     return " ".join([prediction[0] for prediction in prediction_groups[0]])
 
 def get_text_in_image_by_easy_ocr(image_path):
-    reader = easyocr.Reader(['en'])
-    result = reader.readtext(image_path, detail=0)
+    global easy_ocr_reader
+    # Load the models only once for all the test images
+    if easy_ocr_reader is None:
+        easy_ocr_reader = easyocr.Reader(['en'])
+    result = easy_ocr_reader.readtext(image_path, detail=0)
     return " ".join(result)
 
 def pdf_to_text(url):
@@ -100,13 +123,13 @@ def main():
         filename = row["filename"]
         correct_text = row["correct_text"]
         # Tesseract
-        # text = get_text_in_image_by_tesseract(join(dirname(experiment_file_path) + "/test_images", filename))
+        # text = get_cached_text(join(dirname(experiment_file_path) + "/test_images", filename), "tesseract", get_text_in_image_by_tesseract)
 
         # Keras-OCR
-        # text = get_text_in_image_by_keras_ocr(join(dirname(experiment_file_path) + "/test_images", filename))
+        # text = get_cached_text(join(dirname(experiment_file_path) + "/test_images", filename), "keras_ocr", get_text_in_image_by_keras_ocr)
 
         # EasyOCR
-        text = get_text_in_image_by_easy_ocr(join(dirname(experiment_file_path) + "/test_images", filename))
+        text = get_cached_text(join(dirname(experiment_file_path) + "/test_images", filename), "easyocr", get_text_in_image_by_easy_ocr)
 
         print(f'{filename}')
 